@@ -1,7 +1,12 @@
 import os
+import threading
 from dotenv import load_dotenv
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-from slack_handlers import app
+from slack_handlers import app, browser_session, workspace_directory
+from slack_users import user_cache
+from ninety_automation import item_index
+from item_index import IndexSyncer
+from config import SLACK_USER_CACHE_WARMUP, NINETY_BACKEND, NINETY_INDEX_SYNC_INTERVAL
 from monitoring import start_metrics_server, logger
 
 # Load environment variables
@@ -14,6 +19,17 @@ def main():
         start_metrics_server(port=int(os.getenv("METRICS_PORT", 8000)))
         logger.info("app_starting")
         
+        # Preload Slack user profiles without delaying startup
+        if SLACK_USER_CACHE_WARMUP:
+            threading.Thread(target=user_cache.warm, args=(app.client,), daemon=True).start()
+        
+        # Load the workspace pickers' options ahead of the first modal
+        workspace_directory.start()
+        
+        # Keep the local search index in sync with Ninety.io
+        if item_index is not None and NINETY_BACKEND == "browser":
+            IndexSyncer(item_index, browser_session, NINETY_INDEX_SYNC_INTERVAL).start()
+        
         # Initialize Socket Mode handler
         handler = SocketModeHandler(
             app_token=os.getenv("SLACK_APP_TOKEN"),
@@ -0,0 +1,59 @@
+"""Compare the full and lightweight browser profiles.
+
+For each profile, launches fresh browsers and reports the median time to
+start the driver, load the login page, log in and load the search page,
+along with the resident memory of the browser afterwards.
+
+Usage:
+    python bench_browser_profile.py --runs 5
+"""
+import argparse
+import statistics
+import time
+from ninety_automation import NinetyAutomation
+
+PROFILES = ["full", "lightweight"]
+
+def measure(profile: str) -> dict:
+    start_time = time.perf_counter()
+    ninety = NinetyAutomation(profile=profile)
+    sample = {"startup": time.perf_counter() - start_time}
+    try:
+        start_time = time.perf_counter()
+        ninety._load_page(f"{ninety.base_url}/login")
+        sample["login_page"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        ninety.login()
+        sample["login"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        ninety._load_page(f"{ninety.base_url}/search")
+        sample["search_page"] = time.perf_counter() - start_time
+
+        sample["rss_mb"] = (ninety.memory_usage() or 0) / (1024 * 1024)
+    finally:
+        ninety.close()
+    return sample
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="browsers launched per profile")
+    parser.add_argument("--profile", choices=PROFILES, action="append",
+                        help="profile to measure; repeat for several (default: all)")
+    args = parser.parse_args()
+
+    for profile in args.profile or PROFILES:
+        samples = [measure(profile) for _ in range(args.runs)]
+        medians = {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+        print(
+            f"{profile:12} "
+            f"startup={medians['startup'] * 1000:7.0f}ms "
+            f"login_page={medians['login_page'] * 1000:7.0f}ms "
+            f"login={medians['login'] * 1000:7.0f}ms "
+            f"search_page={medians['search_page'] * 1000:7.0f}ms "
+            f"rss={medians['rss_mb']:6.0f}MB"
+        )
+
+if __name__ == "__main__":
+    main()
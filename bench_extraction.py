@@ -0,0 +1,76 @@
+"""Micro-benchmark for search result extraction.
+
+Compares the old per-element extraction (one WebDriver round-trip per
+find_element/get_attribute call) with NinetyAutomation._extract_rows, which
+collects every row in a single execute_script call. Both run against the
+same loaded search page, so page load time is excluded.
+
+Usage:
+    python bench_extraction.py --query "budget" --runs 20
+"""
+import argparse
+import statistics
+import time
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+from ninety_automation import NinetyAutomation, SEARCH_RESULT_SELECTOR, SEARCH_RESULT_FIELDS
+
+def extract_per_element(ninety: NinetyAutomation):
+    """The extraction search_items used before bulk extraction"""
+    results = []
+    for element in ninety.driver.find_elements(By.CSS_SELECTOR, SEARCH_RESULT_SELECTOR):
+        item = {
+            "id": element.get_attribute("data-item-id"),
+            "title": element.find_element(By.CSS_SELECTOR, "[data-testid='item-title']").text,
+            "type": element.get_attribute("data-item-type"),
+            "description": element.find_element(By.CSS_SELECTOR, "[data-testid='item-description']").text,
+            "url": element.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
+        }
+        try:
+            item["status"] = element.find_element(By.CSS_SELECTOR, "[data-testid='item-status']").text
+        except NoSuchElementException:
+            pass
+        try:
+            item["due_date"] = element.find_element(By.CSS_SELECTOR, "[data-testid='item-due-date']").text
+        except NoSuchElementException:
+            pass
+        results.append(item)
+    return results
+
+def extract_bulk(ninety: NinetyAutomation):
+    return ninety._extract_rows(SEARCH_RESULT_SELECTOR, SEARCH_RESULT_FIELDS)
+
+def time_runs(extract, ninety: NinetyAutomation, runs: int):
+    timings = []
+    rows = 0
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        rows = len(extract(ninety))
+        timings.append(time.perf_counter() - start_time)
+    return timings, rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--query", default="", help="search query used to populate the result page")
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per extraction method")
+    args = parser.parse_args()
+
+    ninety = NinetyAutomation()
+    try:
+        # Load the result page once through the normal search path
+        ninety.search_items(args.query, live=True)
+
+        for name, extract in (("per_element", extract_per_element), ("bulk_script", extract_bulk)):
+            extract(ninety)  # warm-up
+            timings, rows = time_runs(extract, ninety, args.runs)
+            print(
+                f"{name:12} rows={rows:4d} "
+                f"median={statistics.median(timings) * 1000:8.1f}ms "
+                f"min={min(timings) * 1000:8.1f}ms "
+                f"max={max(timings) * 1000:8.1f}ms"
+            )
+    finally:
+        ninety.close()
+
+if __name__ == "__main__":
+    main()
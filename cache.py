@@ -0,0 +1,311 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+from redis import Redis
+from redis.exceptions import RedisError
+from monitoring import CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS, log_error, logger
+
+# Delete the lock only if we still own it, so a slow holder whose lock
+# expired cannot release a lock another replica has since acquired
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Store a value and record its key in its group's set, extending the set's
+# expiry so it outlives every member
+_SET_IN_GROUP_SCRIPT = """
+redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('sadd', KEYS[2], KEYS[1])
+if redis.call('ttl', KEYS[2]) < tonumber(ARGV[2]) then
+    redis.call('expire', KEYS[2], ARGV[2])
+end
+redis.call('sadd', KEYS[3], ARGV[3])
+return 1
+"""
+
+# Delete every key recorded in a group's set, then the set itself
+_INVALIDATE_GROUP_SCRIPT = """
+local keys = redis.call('smembers', KEYS[1])
+for i = 1, #keys, 500 do
+    redis.call('del', unpack(keys, i, math.min(i + 499, #keys)))
+end
+redis.call('del', KEYS[1])
+return #keys
+"""
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry TTL and LRU size eviction.
+
+    Expired entries are dropped lazily when they are read or when the cache
+    needs room, so no background reaper thread is required.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    CACHE_HITS.labels(cache=self.name).inc()
+                    return value
+                del self._entries[key]
+                CACHE_EVICTIONS.labels(cache=self.name, reason="expired").inc()
+        CACHE_MISSES.labels(cache=self.name).inc()
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (defaults to the cache TTL)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._purge_expired()
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(cache=self.name, reason="size").inc()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                CACHE_EVICTIONS.labels(cache=self.name, reason="invalidated").inc()
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches predicate, returning how many were dropped"""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            CACHE_EVICTIONS.labels(cache=self.name, reason="invalidated").inc(len(stale))
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            CACHE_EVICTIONS.labels(cache=self.name, reason="expired").inc(len(expired))
+
+class RedisCache:
+    """Cache tier shared between replicas, storing JSON payloads in Redis.
+
+    get_or_compute takes a short-lived lock per key so that only one replica
+    computes a missing value while the others poll for its result. Redis
+    failures are logged and treated as misses so the caller can still
+    compute the value locally.
+
+    With ``group``, each key is also recorded in a Redis set for the group
+    it maps to (e.g. the workspace of a search), so invalidate_group drops
+    a group's entries in one call instead of scanning the keyspace.
+    """
+
+    def __init__(self, name: str, client: Redis, lock_timeout: float = 30,
+                 wait_timeout: float = 20, prefix: str = "ninety:cache",
+                 group: Optional[Callable[[Hashable], str]] = None):
+        self.name = name
+        self.client = client
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.group = group
+        self._prefix = f"{prefix}:{name}:"
+        self._groups_key = f"{prefix}:{name}-groups"
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or None if missing or Redis is unavailable"""
+        try:
+            payload = self.client.get(self._redis_key(key))
+        except RedisError as e:
+            log_error(e, {"action": "redis_cache_get", "cache": self.name})
+            return None
+        if payload is None:
+            CACHE_MISSES.labels(cache=f"{self.name}_redis").inc()
+            return None
+        CACHE_HITS.labels(cache=f"{self.name}_redis").inc()
+        return json.loads(payload)
+
+    def get_with_ttl(self, key: Hashable) -> Tuple[Any, Optional[float]]:
+        """Return the cached value for key and its remaining seconds, or (None, None)"""
+        redis_key = self._redis_key(key)
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.get(redis_key)
+            pipeline.pttl(redis_key)
+            payload, pttl = pipeline.execute()
+        except RedisError as e:
+            log_error(e, {"action": "redis_cache_get", "cache": self.name})
+            return None, None
+        if payload is None:
+            CACHE_MISSES.labels(cache=f"{self.name}_redis").inc()
+            return None, None
+        CACHE_HITS.labels(cache=f"{self.name}_redis").inc()
+        return json.loads(payload), (pttl / 1000 if pttl > 0 else None)
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store value under key for ttl seconds"""
+        ttl = max(1, int(ttl))
+        try:
+            if self.group is None:
+                self.client.set(self._redis_key(key), json.dumps(value), ex=ttl)
+            else:
+                group = self.group(key)
+                self.client.eval(
+                    _SET_IN_GROUP_SCRIPT, 3,
+                    self._redis_key(key), self._group_key(group), self._groups_key,
+                    json.dumps(value), ttl, group
+                )
+        except RedisError as e:
+            log_error(e, {"action": "redis_cache_set", "cache": self.name})
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: float) -> Any:
+        """Return the cached value, computing it on at most one replica when missing"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        lock_key = f"{self._redis_key(key)}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.client.set(lock_key, token, nx=True, ex=max(1, int(self.lock_timeout)))
+        except RedisError as e:
+            log_error(e, {"action": "redis_cache_lock", "cache": self.name})
+            return compute()
+
+        if acquired:
+            try:
+                value = compute()
+                self.set(key, value, ttl)
+                return value
+            finally:
+                try:
+                    self.client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except RedisError as e:
+                    log_error(e, {"action": "redis_cache_unlock", "cache": self.name})
+
+        # Another replica is computing this key; wait for its result
+        deadline = time.time() + self.wait_timeout
+        while time.time() < deadline:
+            time.sleep(0.1)
+            value = self.get(key)
+            if value is not None:
+                return value
+            try:
+                if not self.client.exists(lock_key):
+                    break
+            except RedisError:
+                break
+        logger.info("redis_cache_wait_expired", cache=self.name)
+        return compute()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        try:
+            self.client.delete(self._redis_key(key))
+        except RedisError as e:
+            log_error(e, {"action": "redis_cache_invalidate", "cache": self.name})
+
+    def invalidate_group(self, group: Optional[str]) -> int:
+        """Drop every entry in group, or in every group if None, returning how many were dropped"""
+        if self.group is None:
+            raise ValueError(f"Cache {self.name} has no groups")
+        try:
+            groups = [group] if group is not None else list(self.client.smembers(self._groups_key))
+            dropped = 0
+            for name in groups:
+                dropped += self.client.eval(_INVALIDATE_GROUP_SCRIPT, 1, self._group_key(name))
+            if group is None:
+                self.client.delete(self._groups_key)
+        except RedisError as e:
+            log_error(e, {"action": "redis_cache_invalidate", "cache": self.name})
+            return 0
+        return dropped
+
+    def _redis_key(self, key: Hashable) -> str:
+        return self._prefix + json.dumps(list(key) if isinstance(key, tuple) else key)
+
+    def _group_key(self, group: str) -> str:
+        return f"{self._prefix}group:{group}"
+
+class TieredCache:
+    """In-process TTLCache in front of an optional shared RedisCache.
+
+    ``group`` maps a key to the group invalidate_group drops it with; the
+    shared tier must be built with the same function.
+    """
+
+    def __init__(self, local: TTLCache, shared: Optional[RedisCache] = None,
+                 group: Optional[Callable[[Hashable], str]] = None):
+        self.local = local
+        self.shared = shared
+        self.group = group
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return the value for key from the nearest tier, computing it on a full miss"""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        ttl = self.local.ttl if ttl is None else ttl
+        if self.shared is not None:
+            value = self.shared.get_or_compute(key, compute, ttl)
+        else:
+            value = compute()
+        self.local.set(key, value, ttl)
+        return value
+
+    def get(self, key: Hashable) -> Any:
+        """Return the value for key from the nearest tier, or None without computing it"""
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value, remaining = self.shared.get_with_ttl(key)
+            if value is not None:
+                # Keep the entry's own TTL rather than the local default, the longest of any type
+                self.local.set(key, value, remaining)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value in every tier"""
+        ttl = self.local.ttl if ttl is None else ttl
+        self.local.set(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry from every tier"""
+        self.local.invalidate(key)
+        if self.shared is not None:
+            self.shared.invalidate(key)
+
+    def invalidate_group(self, group: Optional[str]) -> int:
+        """Drop every entry in group, or in every group if None, from every tier"""
+        if self.group is None:
+            raise ValueError(f"Cache {self.local.name} has no groups")
+        dropped = self.local.invalidate_where(lambda key: group is None or self.group(key) == group)
+        if self.shared is not None:
+            dropped += self.shared.invalidate_group(group)
+        return dropped
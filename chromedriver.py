@@ -0,0 +1,77 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from typing import Optional
+from webdriver_manager.chrome import ChromeDriverManager
+from config import NINETY_CHROMEDRIVER_PATH, NINETY_CHROMEDRIVER_CACHE_DIR
+from monitoring import CHROMEDRIVER_RESOLVE_TIME, log_error, logger
+
+_PINNED_NAME = "chromedriver.exe" if os.name == "nt" else "chromedriver"
+
+_lock = threading.Lock()
+_resolved_path: Optional[str] = None
+
+def _verify(path: str) -> bool:
+    """Whether path is a chromedriver binary that actually runs"""
+    if not os.path.isfile(path) or not os.access(path, os.X_OK):
+        return False
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return output.startswith("ChromeDriver")
+
+def _pin_downloaded_driver(pinned_path: str) -> str:
+    """Resolve a matching chromedriver with webdriver-manager and copy it into the cache directory"""
+    downloaded = ChromeDriverManager().install()
+    os.makedirs(os.path.dirname(pinned_path) or ".", exist_ok=True)
+    # Copy then rename so another process never sees a half-written binary
+    staging_path = f"{pinned_path}.{os.getpid()}.tmp"
+    shutil.copy2(downloaded, staging_path)
+    os.chmod(staging_path, 0o755)
+    os.replace(staging_path, pinned_path)
+    return pinned_path
+
+def chromedriver_path() -> str:
+    """Path to a verified chromedriver, resolved once per process.
+
+    Uses NINETY_CHROMEDRIVER_PATH when set. Otherwise a binary pinned in
+    NINETY_CHROMEDRIVER_CACHE_DIR is reused across restarts, and
+    webdriver-manager is only consulted when there is no working pin.
+    """
+    global _resolved_path
+    with _lock:
+        if _resolved_path:
+            return _resolved_path
+
+        start_time = time.time()
+        if NINETY_CHROMEDRIVER_PATH:
+            if not _verify(NINETY_CHROMEDRIVER_PATH):
+                raise RuntimeError(f"NINETY_CHROMEDRIVER_PATH is not a working chromedriver: {NINETY_CHROMEDRIVER_PATH}")
+            path, source = NINETY_CHROMEDRIVER_PATH, "configured"
+        else:
+            path = os.path.join(NINETY_CHROMEDRIVER_CACHE_DIR, _PINNED_NAME)
+            source = "pinned"
+            if not _verify(path):
+                path = _pin_downloaded_driver(path)
+                source = "download"
+                if not _verify(path):
+                    raise RuntimeError(f"Downloaded chromedriver does not run: {path}")
+
+        CHROMEDRIVER_RESOLVE_TIME.labels(source=source).observe(time.time() - start_time)
+        logger.info("chromedriver_resolved", path=path, source=source)
+        _resolved_path = path
+        return path
+
+def invalidate_chromedriver() -> None:
+    """Drop the pinned driver, e.g. after Chrome was upgraded past it, so the next call re-resolves"""
+    global _resolved_path
+    with _lock:
+        if not NINETY_CHROMEDRIVER_PATH and _resolved_path:
+            try:
+                os.remove(_resolved_path)
+            except OSError as e:
+                log_error(e, {"action": "invalidate_chromedriver"})
+        _resolved_path = None
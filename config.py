@@ -12,6 +12,128 @@ SLACK_SIGNING_SECRET = os.getenv('SLACK_SIGNING_SECRET')
 NINETY_EMAIL = os.getenv('NINETY_EMAIL')
 NINETY_PASSWORD = os.getenv('NINETY_PASSWORD')
 
+# Backend used by the Slack handlers: "browser" drives Ninety.io with Selenium,
+# "api" uses the REST API and falls back to the browser for anything it lacks
+NINETY_BACKEND = os.getenv('NINETY_BACKEND', 'browser').lower()
+NINETY_API_KEY = os.getenv('NINETY_API_KEY')
+NINETY_ORGANIZATION_ID = os.getenv('NINETY_ORGANIZATION_ID')
+NINETY_API_BASE_URL = os.getenv('NINETY_API_BASE_URL', 'https://api.ninety.io/v1')
+
+# Slack user profile cache used when formatting conversations
+SLACK_USER_CACHE_SIZE = int(os.getenv('SLACK_USER_CACHE_SIZE', 5000))
+SLACK_USER_CACHE_TTL = float(os.getenv('SLACK_USER_CACHE_TTL', 3600))
+SLACK_USER_CACHE_WARMUP = os.getenv('SLACK_USER_CACHE_WARMUP', 'false').lower() == 'true'
+
+# Thread export for attaching conversations: messages fetched per
+# conversations.replies page, and the most conversation text posted as one
+# Ninety.io comment (longer threads become several comments)
+SLACK_THREAD_PAGE_SIZE = int(os.getenv('SLACK_THREAD_PAGE_SIZE', 200))
+NINETY_COMMENT_MAX_CHARS = int(os.getenv('NINETY_COMMENT_MAX_CHARS', 4000))
+
+# Browser pool configuration
+NINETY_POOL_MIN_SIZE = int(os.getenv('NINETY_POOL_MIN_SIZE', 1))
+NINETY_POOL_MAX_SIZE = int(os.getenv('NINETY_POOL_MAX_SIZE', 4))
+NINETY_POOL_CHECKOUT_TIMEOUT = float(os.getenv('NINETY_POOL_CHECKOUT_TIMEOUT', 30))
+# Logged-in browsers kept ready to replace a crashed or logged-out worker, and
+# how often (in seconds) they are health-checked in the background
+NINETY_POOL_STANDBY_SIZE = int(os.getenv('NINETY_POOL_STANDBY_SIZE', 1))
+NINETY_POOL_STANDBY_CHECK_INTERVAL = float(os.getenv('NINETY_POOL_STANDBY_CHECK_INTERVAL', 60))
+# Minimum seconds between browser memory samples taken when workers are checked in
+NINETY_POOL_RSS_SAMPLE_INTERVAL = float(os.getenv('NINETY_POOL_RSS_SAMPLE_INTERVAL', 60))
+
+# Tabs each browser may open to run independent reads (item details, searches,
+# subscriptions) side by side; 1 keeps every operation in a single tab
+NINETY_BROWSER_TABS = int(os.getenv('NINETY_BROWSER_TABS', 3))
+
+# Chromedriver binary. NINETY_CHROMEDRIVER_PATH uses a preinstalled driver as is;
+# otherwise one is resolved once with webdriver-manager and pinned in
+# NINETY_CHROMEDRIVER_CACHE_DIR so later startups skip the version lookup.
+NINETY_CHROMEDRIVER_PATH = os.getenv('NINETY_CHROMEDRIVER_PATH')
+NINETY_CHROMEDRIVER_CACHE_DIR = os.getenv('NINETY_CHROMEDRIVER_CACHE_DIR', '.chromedriver')
+
+# Browser profile. "lightweight" skips images, fonts, media and the tracker
+# domains below, disables extensions and GPU features, and returns from
+# navigation once the DOM is ready; "full" launches Chrome as a user would see it.
+NINETY_BROWSER_PROFILE = os.getenv('NINETY_BROWSER_PROFILE', 'lightweight').lower()
+NINETY_BLOCKED_DOMAINS = [
+    domain.strip() for domain in os.getenv(
+        'NINETY_BLOCKED_DOMAINS',
+        'google-analytics.com,googletagmanager.com,doubleclick.net,segment.io,segment.com,'
+        'hotjar.com,fullstory.com,mixpanel.com,intercom.io,intercomcdn.com,facebook.net,sentry-cdn.com'
+    ).split(',') if domain.strip()
+]
+
+# Background job queue that runs Ninety.io work off the Slack request threads
+NINETY_JOB_WORKERS = int(os.getenv('NINETY_JOB_WORKERS', NINETY_POOL_MAX_SIZE))
+NINETY_JOB_QUEUE_SIZE = int(os.getenv('NINETY_JOB_QUEUE_SIZE', 100))
+
+# Speculative loading of item details when search results are shown. Prefetches
+# give up if no browser is free within the checkout timeout, so they never queue
+# behind user-facing work.
+NINETY_PREFETCH_TOP_N = int(os.getenv('NINETY_PREFETCH_TOP_N', 3))
+NINETY_PREFETCH_WORKERS = int(os.getenv('NINETY_PREFETCH_WORKERS', 1))
+NINETY_PREFETCH_CHECKOUT_TIMEOUT = float(os.getenv('NINETY_PREFETCH_CHECKOUT_TIMEOUT', 1))
+
+# Most items one bulk create (multi-line /ninety-create or a thread) may contain
+NINETY_BULK_CREATE_MAX_ITEMS = int(os.getenv('NINETY_BULK_CREATE_MAX_ITEMS', 25))
+
+# Workspace that "default" (no workspace chosen) means for searches. When unset,
+# the first workspace on the Ninety.io workspaces page is used.
+NINETY_DEFAULT_WORKSPACE_ID = os.getenv('NINETY_DEFAULT_WORKSPACE_ID')
+
+# Seconds between background refreshes of the workspace list shown in pickers
+NINETY_WORKSPACE_REFRESH_INTERVAL = float(os.getenv('NINETY_WORKSPACE_REFRESH_INTERVAL', 900))
+
+# Seconds /ninety-search waits for all item types before posting partial results
+NINETY_SEARCH_DEADLINE = float(os.getenv('NINETY_SEARCH_DEADLINE', 10))
+
+# Seconds link unfurling waits before posting the links that are ready
+NINETY_UNFURL_DEADLINE = float(os.getenv('NINETY_UNFURL_DEADLINE', 3))
+# Seconds after that to wait for slower links before dropping them
+NINETY_UNFURL_LATE_DEADLINE = float(os.getenv('NINETY_UNFURL_LATE_DEADLINE', NINETY_UNFURL_DEADLINE * 5))
+
+# Page settle waits: the page counts as settled once the DOM (and the result
+# count, where one is watched) has been unchanged for the quiet period
+NINETY_WAIT_QUIET_PERIOD = float(os.getenv('NINETY_WAIT_QUIET_PERIOD', 0.3))
+NINETY_WAIT_TIMEOUTS = {
+    "search_results": float(os.getenv('NINETY_WAIT_TIMEOUT_SEARCH_RESULTS', 5)),
+    "switch_workspace": float(os.getenv('NINETY_WAIT_TIMEOUT_SWITCH_WORKSPACE', 5)),
+    "search_rocks": float(os.getenv('NINETY_WAIT_TIMEOUT_SEARCH_ROCKS', 3))
+}
+
+# Search result cache
+NINETY_SEARCH_CACHE_SIZE = int(os.getenv('NINETY_SEARCH_CACHE_SIZE', 256))
+NINETY_SEARCH_CACHE_TTL = float(os.getenv('NINETY_SEARCH_CACHE_TTL', 300))
+
+# Item detail cache, with TTLs per item type
+NINETY_ITEM_CACHE_SIZE = int(os.getenv('NINETY_ITEM_CACHE_SIZE', 512))
+NINETY_ITEM_CACHE_TTLS = {
+    "headline": float(os.getenv('NINETY_ITEM_CACHE_TTL_HEADLINE', 600)),
+    "todo": float(os.getenv('NINETY_ITEM_CACHE_TTL_TODO', 120)),
+    "issue": float(os.getenv('NINETY_ITEM_CACHE_TTL_ISSUE', 120)),
+    "rock": float(os.getenv('NINETY_ITEM_CACHE_TTL_ROCK', 600))
+}
+
+# Optional Redis tier shared between replicas for search results and item details
+NINETY_SHARED_CACHE_ENABLED = os.getenv('NINETY_SHARED_CACHE_ENABLED', 'false').lower() == 'true'
+
+# Local full-text index of items, resynced in the background every
+# NINETY_INDEX_SYNC_INTERVAL seconds. Searches fall back to the browser when
+# the index is older than NINETY_INDEX_MAX_AGE. Each sync lists every indexed
+# type of every searched workspace on a pooled browser, so it is opt-in, and
+# kept on disk so a restart does not start from an empty index.
+NINETY_INDEX_ENABLED = os.getenv('NINETY_INDEX_ENABLED', 'false').lower() == 'true'
+NINETY_INDEX_PATH = os.getenv('NINETY_INDEX_PATH', '.ninety_index.sqlite')
+NINETY_INDEX_SYNC_INTERVAL = float(os.getenv('NINETY_INDEX_SYNC_INTERVAL', 120))
+NINETY_INDEX_MAX_AGE = float(os.getenv('NINETY_INDEX_MAX_AGE', 600))
+
+# Reuse of the authenticated browser session across restarts. NINETY_SESSION_STORE
+# is one of "file", "redis" or "none"; NINETY_SESSION_KEY is a Fernet key used to
+# encrypt the stored cookies and must be set for persistence to be enabled.
+NINETY_SESSION_STORE = os.getenv('NINETY_SESSION_STORE', 'file').lower()
+NINETY_SESSION_FILE = os.getenv('NINETY_SESSION_FILE', '.ninety_session')
+NINETY_SESSION_KEY = os.getenv('NINETY_SESSION_KEY')
+
 # Validate required environment variables
 required_vars = [
     'SLACK_BOT_TOKEN',
@@ -19,6 +141,8 @@ required_vars = [
     'NINETY_EMAIL',
     'NINETY_PASSWORD'
 ]
+if NINETY_BACKEND == 'api':
+    required_vars += ['NINETY_API_KEY', 'NINETY_ORGANIZATION_ID']
 
 missing_vars = [var for var in required_vars if not globals()[var]]
 if missing_vars:
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, ContextManager, Dict, List, Optional, Set
+from monitoring import INDEX_ITEMS, REQUEST_LATENCY, log_error, logger
+
+INDEXED_TYPES = ["headline", "todo", "issue"]
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items USING fts5(
+    item_id UNINDEXED,
+    item_type UNINDEXED,
+    workspace_id UNINDEXED,
+    title,
+    description,
+    status UNINDEXED,
+    due_date UNINDEXED,
+    url UNINDEXED,
+    content_hash UNINDEXED
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    workspace_id TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (workspace_id, item_type)
+);
+"""
+
+def normalize_item_type(item_type: Optional[str]) -> Optional[str]:
+    """Map the "headlines"/"headline"/"all" spellings used by handlers to an indexed type or None"""
+    if not item_type or item_type == "all":
+        return None
+    return item_type[:-1] if item_type.endswith("s") else item_type
+
+def normalize_workspace(workspace_id: Optional[str]) -> str:
+    return workspace_id or "default"
+
+def _match_expression(query: str) -> str:
+    """Turn free text into an FTS5 prefix query, quoting each word so user input cannot inject syntax"""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+def _content_hash(item: Dict) -> str:
+    return hashlib.sha1(json.dumps(item, sort_keys=True).encode()).hexdigest()
+
+class ItemIndex:
+    """Full-text index of Ninety.io headlines, to-dos and issues in SQLite FTS5.
+
+    The index is filled by IndexSyncer and answers searches locally. Each
+    (workspace, item type) tracks when it was last synced so callers can
+    tell whether the local answer is fresh enough.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+        self._workspaces: Set[str] = set()
+
+    def sync(self, item_type: str, workspace_id: Optional[str], items: List[Dict]) -> Dict[str, int]:
+        """Bring one (workspace, item type) in line with a complete listing, writing only changed rows.
+
+        Rows missing from items are deleted, so items must be every item of
+        the type (see NinetyAutomation.list_items), not a page of search
+        results. An empty listing is recorded as synced.
+        """
+        item_type = normalize_item_type(item_type)
+        workspace_id = normalize_workspace(workspace_id)
+        incoming = {item["id"]: item for item in items if item.get("id")}
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock, self._conn:
+            existing = {
+                row["item_id"]: (row["rowid"], row["content_hash"])
+                for row in self._conn.execute(
+                    "SELECT rowid, item_id, content_hash FROM items WHERE workspace_id = ? AND item_type = ?",
+                    (workspace_id, item_type)
+                )
+            }
+            for item_id, item in incoming.items():
+                content_hash = _content_hash(item)
+                current = existing.get(item_id)
+                if current and current[1] == content_hash:
+                    continue
+                if current:
+                    self._conn.execute("DELETE FROM items WHERE rowid = ?", (current[0],))
+                    stats["updated"] += 1
+                else:
+                    stats["added"] += 1
+                self._conn.execute(
+                    "INSERT INTO items (item_id, item_type, workspace_id, title, description, status,"
+                    " due_date, url, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (item_id, item_type, workspace_id, item.get("title", ""), item.get("description", ""),
+                     item.get("status"), item.get("due_date"), item.get("url"), content_hash)
+                )
+            for item_id, (rowid, _) in existing.items():
+                if item_id not in incoming:
+                    self._conn.execute("DELETE FROM items WHERE rowid = ?", (rowid,))
+                    stats["removed"] += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (workspace_id, item_type, synced_at) VALUES (?, ?, ?)",
+                (workspace_id, item_type, time.time())
+            )
+            total = self._conn.execute("SELECT count(*) FROM items").fetchone()[0]
+        INDEX_ITEMS.set(total)
+        return stats
+
+    def search(self, query: str = "", item_type: Optional[str] = None,
+               workspace_id: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Search the index, returning rows shaped like NinetyAutomation.search_items results"""
+        item_type = normalize_item_type(item_type)
+        sql = "SELECT * FROM items WHERE workspace_id = ?"
+        params: list = [normalize_workspace(workspace_id)]
+        if item_type:
+            sql += " AND item_type = ?"
+            params.append(item_type)
+        expression = _match_expression(query)
+        if expression:
+            sql += " AND items MATCH ? ORDER BY rank"
+            params.append(expression)
+        else:
+            sql += " ORDER BY rowid DESC"
+        sql += " LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        results = []
+        for row in rows:
+            item = {
+                "id": row["item_id"],
+                "title": row["title"],
+                "type": row["item_type"],
+                "description": row["description"],
+                "url": row["url"]
+            }
+            if row["status"] is not None:
+                item["status"] = row["status"]
+            if row["due_date"] is not None:
+                item["due_date"] = row["due_date"]
+            results.append(item)
+        return results
+
+    def is_fresh(self, item_type: Optional[str], workspace_id: Optional[str], max_age: float) -> bool:
+        """Whether every type covered by a search was synced within max_age seconds"""
+        workspace_id = normalize_workspace(workspace_id)
+        item_type = normalize_item_type(item_type)
+        if item_type is not None and item_type not in INDEXED_TYPES:
+            return False
+        types = [item_type] if item_type else INDEXED_TYPES
+        with self._lock:
+            self._workspaces.add(workspace_id)
+            rows = self._conn.execute(
+                f"SELECT item_type, synced_at FROM sync_state WHERE workspace_id = ?"
+                f" AND item_type IN ({', '.join('?' * len(types))})",
+                [workspace_id, *types]
+            ).fetchall()
+        if len(rows) < len(types):
+            return False
+        oldest = min(row["synced_at"] for row in rows)
+        return time.time() - oldest <= max_age
+
+    def mark_stale(self, workspace_id: Optional[str]) -> None:
+        """Force searches in a workspace, or in every workspace if None, to go live until the next sync"""
+        with self._lock, self._conn:
+            if workspace_id is None:
+                self._conn.execute("DELETE FROM sync_state")
+            else:
+                self._conn.execute("DELETE FROM sync_state WHERE workspace_id = ?", (workspace_id,))
+
+    def workspaces(self) -> List[str]:
+        """Workspaces (real ids, never "default") that have been searched and so should be kept in sync"""
+        with self._lock:
+            return sorted(self._workspaces)
+
+class IndexSyncer:
+    """Background thread that periodically re-lists items into an ItemIndex"""
+
+    def __init__(self, index: ItemIndex, session_factory: Callable[..., ContextManager],
+                 interval: float):
+        self.index = index
+        self._session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ninety-index-sync", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def sync_once(self) -> None:
+        """Sync every indexed type in every tracked workspace"""
+        for workspace_id in self.index.workspaces():
+            for item_type in INDEXED_TYPES:
+                start_time = time.time()
+                try:
+                    with self._session_factory(workspace_id=workspace_id) as ninety:
+                        items = ninety.list_items(item_type, workspace_id)
+                    stats = self.index.sync(item_type, workspace_id, items)
+                    logger.info("index_synced", workspace_id=workspace_id, item_type=item_type, **stats)
+                except Exception as e:
+                    log_error(e, {"action": "index_sync", "workspace_id": workspace_id, "item_type": item_type})
+                REQUEST_LATENCY.labels(type="index_sync").observe(time.time() - start_time)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sync_once()
+            self._stop.wait(self.interval)
@@ -0,0 +1,162 @@
+import contextvars
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, Hashable, List, Optional
+from ninety_automation import NinetyAutomation
+from monitoring import (
+    COALESCED_CALLS,
+    JOB_QUEUE_DEPTH,
+    JOB_LATENCY,
+    JOB_RETRIES,
+    log_error,
+    logger
+)
+
+JOB_CREATE = "create"
+JOB_UPDATE = "update"
+JOB_ATTACH = "attach"
+JOB_SEARCH = "search"
+
+# Creates and attaches are not idempotent, so a failed attempt is never replayed
+DEFAULT_MAX_RETRIES = {
+    JOB_CREATE: 0,
+    JOB_UPDATE: 1,
+    JOB_ATTACH: 0,
+    JOB_SEARCH: 2
+}
+
+# Seconds before the first retry, doubling with each further attempt
+RETRY_BACKOFF = 1.0
+
+@dataclass
+class Job:
+    """A unit of Ninety.io work run on a pooled browser off the Slack request thread"""
+    kind: str
+    run: Callable[[NinetyAutomation], Any]
+    on_success: Callable[[Any], None]
+    on_failure: Callable[[Exception], None]
+    max_retries: Optional[int] = None
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    # Workspace the job searches, so it runs on a browser already there if possible
+    workspace_id: Optional[str] = None
+    # Absolute time.time() by which the job must have a browser; checkout
+    # waits no longer, and a job still queued then fails
+    deadline: Optional[float] = None
+    # Identical reads submitted while one is queued or running share its
+    # outcome instead of taking a browser; the key starts with the operation name
+    coalesce_key: Optional[Hashable] = None
+    # Context of the submitting request, so rate limits see who the job is for
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+    def __post_init__(self):
+        if self.max_retries is None:
+            self.max_retries = DEFAULT_MAX_RETRIES.get(self.kind, 0)
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+    pass
+
+class JobQueue:
+    """Fixed set of worker threads that run queued Jobs against pooled NinetyAutomation workers"""
+
+    def __init__(self, session_factory: Callable[..., ContextManager[NinetyAutomation]],
+                 workers: int, maxsize: int = 0):
+        self._session_factory = session_factory
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=maxsize)
+        # Followers waiting on each coalesced job that is queued or running
+        self._followers: Dict[Hashable, List[Job]] = {}
+        self._followers_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"ninety-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("job_queue_started", workers=workers)
+
+    def submit(self, job: Job) -> None:
+        """Queue a job without blocking the caller.
+
+        A job whose coalesce_key matches one already queued or running is
+        not queued; it receives that job's result or error when it finishes.
+        """
+        key = job.coalesce_key
+        if key is not None:
+            with self._followers_lock:
+                followers = self._followers.get(key)
+                if followers is not None:
+                    followers.append(job)
+                    COALESCED_CALLS.labels(operation=key[0], role="follower").inc()
+                    return
+                self._followers[key] = []
+            COALESCED_CALLS.labels(operation=key[0], role="leader").inc()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            error = JobQueueFullError("Ninety.io is busy, please try again in a moment")
+            for follower in self._pop_followers(job):
+                self._notify(follower.on_failure, error, follower)
+            raise error
+        JOB_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def shutdown(self) -> None:
+        """Stop the workers once the jobs already queued have run"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            JOB_QUEUE_DEPTH.set(self._queue.qsize())
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        """Run a job, retrying it on this worker with backoff.
+
+        Retries stay on the worker rather than going back on the queue, so
+        a full queue can never block the worker that would drain it.
+        """
+        while True:
+            job.attempts += 1
+            try:
+                timeout = None
+                if job.deadline is not None:
+                    timeout = job.deadline - time.time()
+                    if timeout <= 0:
+                        raise TimeoutError(f"{job.kind} job missed its deadline before getting a browser")
+                with self._session_factory(timeout=timeout, workspace_id=job.workspace_id) as ninety:
+                    result = job.context.run(job.run, ninety)
+                break
+            except Exception as e:
+                if job.attempts <= job.max_retries:
+                    JOB_RETRIES.labels(kind=job.kind).inc()
+                    logger.info("job_retry", kind=job.kind, attempt=job.attempts)
+                    time.sleep(RETRY_BACKOFF * 2 ** (job.attempts - 1))
+                    continue
+                for done in [job] + self._pop_followers(job):
+                    JOB_LATENCY.labels(kind=done.kind, status="failure").observe(time.time() - done.enqueued_at)
+                    self._notify(done.on_failure, e, done)
+                return
+        for done in [job] + self._pop_followers(job):
+            JOB_LATENCY.labels(kind=done.kind, status="success").observe(time.time() - done.enqueued_at)
+            self._notify(done.on_success, result, done)
+
+    def _pop_followers(self, job: Job) -> List[Job]:
+        """Stop coalescing onto a finished job, returning the jobs that waited on it"""
+        if job.coalesce_key is None:
+            return []
+        with self._followers_lock:
+            return self._followers.pop(job.coalesce_key, [])
+
+    def _notify(self, callback: Callable[[Any], None], value: Any, job: Job) -> None:
+        """Report a job outcome back to Slack without letting callback errors kill the worker"""
+        try:
+            callback(value)
+        except Exception as e:
+            log_error(e, {"action": "job_callback", "kind": job.kind})
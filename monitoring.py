@@ -1,12 +1,17 @@
 import os
 import time
+import uuid
+import threading
+import inspect
+import contextvars
 import structlog
 import sentry_sdk
-from prometheus_client import Counter, Histogram, start_http_server
+from concurrent.futures import ThreadPoolExecutor
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 from functools import wraps
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict
 from ratelimit import limits, RateLimitException
-from redis import Redis
+from redis import Redis, RedisError
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -55,6 +60,192 @@ REQUEST_LATENCY = Histogram(
     ["type"]
 )
 
+POOL_WAIT_TIME = Histogram(
+    "ninety_pool_wait_seconds",
+    "Time spent waiting to check out a Ninety.io browser worker"
+)
+
+POOL_SIZE = Gauge(
+    "ninety_pool_size",
+    "Number of Ninety.io browser workers currently alive"
+)
+
+POOL_IN_USE = Gauge(
+    "ninety_pool_in_use",
+    "Number of Ninety.io browser workers currently checked out"
+)
+
+BROWSER_STARTUP_TIME = Histogram(
+    "ninety_browser_startup_seconds",
+    "Time to launch a Chrome WebDriver session",
+    ["profile"]
+)
+
+CHROMEDRIVER_RESOLVE_TIME = Histogram(
+    "ninety_chromedriver_resolve_seconds",
+    "Time to locate and verify the chromedriver binary: configured, pinned or download",
+    ["source"]
+)
+
+PAGE_LOAD_TIME = Histogram(
+    "ninety_page_load_seconds",
+    "Time for a browser navigation to return",
+    ["profile"]
+)
+
+BROWSER_RSS = Histogram(
+    "ninety_browser_rss_bytes",
+    "Resident memory of a browser worker, chromedriver and Chrome processes combined",
+    ["profile"],
+    buckets=[b * 1024 * 1024 for b in (64, 128, 256, 384, 512, 768, 1024, 1536, 2048)]
+)
+
+POOL_STANDBY = Gauge(
+    "ninety_pool_standby",
+    "Number of launched, logged-in Ninety.io browsers waiting to replace a failed worker"
+)
+
+POOL_WORKER_STARTS = Counter(
+    "ninety_pool_worker_starts_total",
+    "Workers added to the pool, by whether a standby was promoted or a browser was launched inline",
+    ["source"]
+)
+
+POOL_WORKSPACE_AFFINITY = Counter(
+    "ninety_pool_workspace_affinity_total",
+    "Checkouts for a specific workspace, by whether an idle worker was already on it",
+    ["outcome"]
+)
+
+WORKSPACE_SWITCHES = Counter(
+    "ninety_workspace_switches_total",
+    "Workspace switches requested of a browser, by whether it had to switch or was already there",
+    ["outcome"]
+)
+
+TAB_OPERATIONS = Counter(
+    "ninety_tab_operations_total",
+    "Total number of operations multiplexed across browser tabs",
+    ["status"]
+)
+
+JOB_QUEUE_DEPTH = Gauge(
+    "ninety_job_queue_depth",
+    "Number of Ninety.io jobs waiting for a worker"
+)
+
+JOB_LATENCY = Histogram(
+    "ninety_job_duration_seconds",
+    "Time from enqueueing a Ninety.io job to its completion",
+    ["kind", "status"]
+)
+
+JOB_RETRIES = Counter(
+    "ninety_job_retries_total",
+    "Total number of Ninety.io job retries",
+    ["kind"]
+)
+
+BACKEND_FALLBACKS = Counter(
+    "ninety_backend_fallbacks_total",
+    "Total number of operations routed from the API backend to the browser",
+    ["operation"]
+)
+
+SLACK_USER_LOOKUPS = Counter(
+    "slack_user_lookups_total",
+    "Slack user lookups by how they were served; cache and dedup are users.info calls saved",
+    ["source"]
+)
+
+THREAD_EXPORT_MESSAGES = Histogram(
+    "slack_thread_export_messages",
+    "Messages in a Slack thread exported to Ninety.io",
+    buckets=[1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+)
+
+THREAD_EXPORT_CHUNKS = Histogram(
+    "slack_thread_export_chunks",
+    "Ninety.io comments an exported Slack thread was split into",
+    buckets=[1, 2, 3, 5, 10, 20, 50]
+)
+
+INDEX_ITEMS = Gauge(
+    "ninety_index_items",
+    "Number of items in the local search index"
+)
+
+INDEX_QUERIES = Counter(
+    "ninety_index_queries_total",
+    "Searches by how they were answered: index, stale (index too old) or live (forced)",
+    ["source"]
+)
+
+PREFETCHES = Counter(
+    "ninety_prefetches_total",
+    "Item detail prefetches by outcome: issued, hit, late, wasted, cancelled or failed",
+    ["outcome"]
+)
+
+COALESCED_CALLS = Counter(
+    "ninety_coalesced_calls_total",
+    "Ninety.io reads by role: leader calls ran, follower calls shared a leader's in-flight result",
+    ["operation", "role"]
+)
+
+RATE_LIMIT_THROTTLED = Counter(
+    "rate_limit_throttled_total",
+    "Calls that hit a rate limit, by whether they were rejected or waited for a slot",
+    ["operation", "scope", "outcome"]
+)
+
+RATE_LIMIT_WAIT = Histogram(
+    "rate_limit_wait_seconds",
+    "Time blocking calls spent waiting for a rate limit slot",
+    ["operation", "scope"]
+)
+
+RATE_LIMIT_BACKEND_HEALTHY = Gauge(
+    "rate_limit_redis_healthy",
+    "1 while rate limits are shared through Redis, 0 while only local limits apply"
+)
+
+RATE_LIMIT_DEGRADED = Counter(
+    "rate_limit_degraded_decisions_total",
+    "Rate limit decisions made from local buckets alone because Redis was unreachable",
+    ["operation"]
+)
+
+MODAL_FIRST_PAINT = Histogram(
+    "slack_modal_first_paint_seconds",
+    "Time from a Slack interaction until its modal shows anything, loading state included",
+    ["modal"]
+)
+
+MODAL_READY = Histogram(
+    "slack_modal_ready_seconds",
+    "Time from a Slack interaction until its modal shows the loaded data",
+    ["modal"]
+)
+
+CACHE_HITS = Counter(
+    "cache_hits_total",
+    "Total number of cache hits",
+    ["cache"]
+)
+
+CACHE_MISSES = Counter(
+    "cache_misses_total",
+    "Total number of cache misses",
+    ["cache"]
+)
+
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Total number of cache entries removed before being read",
+    ["cache", "reason"]
+)
+
 def start_metrics_server(port: int = 8000) -> None:
     """Start Prometheus metrics server"""
     start_http_server(port)
@@ -78,25 +269,227 @@ def track_timing(metric_type: str) -> Callable:
         return wrapper
     return decorator
 
-def rate_limit(calls: int, period: int) -> Callable:
-    """Decorator for rate limiting with Redis"""
+# Sliding-window log in a sorted set shared by every replica. Records a batch
+# of ARGV[2] calls admitted locally since the last sync and returns
+# {calls in the window, ms until the oldest one expires}, all in one
+# round-trip. Uses the Redis clock so every replica agrees on the window.
+_SLIDING_WINDOW_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local count = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+for i = 1, count do
+    redis.call('ZADD', KEYS[1], now, ARGV[3] .. ':' .. i)
+end
+if count > 0 then
+    redis.call('PEXPIRE', KEYS[1], window)
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local retry = 0
+if oldest[2] then
+    retry = math.max(0, tonumber(oldest[2]) + window - now)
+end
+return {redis.call('ZCARD', KEYS[1]), retry}
+"""
+_sliding_window = redis_client.register_script(_SLIDING_WINDOW_SCRIPT)
+
+class _Bucket:
+    """Local view of one rate limit key"""
+
+    def __init__(self, calls: int, period: float):
+        self.calls = calls
+        self.period = period
+        self.tokens = float(calls)
+        self.refilled_at = time.monotonic()
+        self.pending = 0         # admitted here since the last sync
+        self.remote_count = 0    # calls in the shared window at the last sync, ours included
+        self.remote_retry = 0.0  # seconds until the shared window freed a slot, as of the last sync
+        self.synced_at = 0.0
+
+class HybridRateLimiter:
+    """In-process token buckets kept in line with a Redis sliding window.
+
+    Decisions are made locally without a network call: a call is admitted
+    when its local token bucket has a token and the shared window, as last
+    seen plus the calls admitted here since, is under the limit. A
+    background thread pushes locally admitted calls to Redis in one
+    pipelined batch every ``sync_interval`` seconds and reads back the
+    cluster-wide counts, so replicas may briefly overshoot by what they
+    admit between syncs. While Redis is unreachable only the local buckets
+    apply and the limiter reports itself degraded.
+    """
+
+    def __init__(self, client, sync_interval: float):
+        self._client = client
+        self.sync_interval = sync_interval
+        self.healthy = True
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        RATE_LIMIT_BACKEND_HEALTHY.set(1)
+
+    def try_acquire(self, key: str, calls: int, period: float) -> float:
+        """Admit one call for key, returning 0, or the seconds to wait before trying again"""
+        self._ensure_started()
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(calls, period)
+            bucket.tokens = min(calls, bucket.tokens + (now - bucket.refilled_at) * calls / period)
+            bucket.refilled_at = now
+            if bucket.tokens < 1:
+                return (1 - bucket.tokens) * period / calls
+            if self.healthy and bucket.remote_count + bucket.pending >= calls:
+                # Others have used the shared window up; re-check once it frees or after the next sync
+                return max(bucket.synced_at + bucket.remote_retry - now, self.sync_interval)
+            bucket.tokens -= 1
+            bucket.pending += 1
+            return 0
+
+    def sync(self) -> None:
+        """Push pending calls to Redis and refresh the shared counts in one round-trip"""
+        with self._lock:
+            batch = [(key, bucket, bucket.pending) for key, bucket in self._buckets.items()]
+            for _, bucket, _ in batch:
+                bucket.pending = 0
+        if not batch:
+            return
+
+        start_time = time.time()
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for key, bucket, pending in batch:
+                _sliding_window(keys=[key], args=[int(bucket.period * 1000), pending, uuid.uuid4().hex], client=pipeline)
+            results = pipeline.execute()
+        except RedisError as e:
+            with self._lock:
+                for _, bucket, pending in batch:
+                    # Keep the calls for the next sync, but never more than one window's worth
+                    bucket.pending = min(bucket.pending + pending, bucket.calls)
+            self._set_healthy(False, e)
+            return
+        REQUEST_LATENCY.labels(type="rate_limit_sync").observe(time.time() - start_time)
+
+        now = time.monotonic()
+        with self._lock:
+            for (key, bucket, _), (count, retry_ms) in zip(batch, results):
+                bucket.remote_count = int(count)
+                bucket.remote_retry = int(retry_ms) / 1000
+                bucket.synced_at = now
+                if not count and not bucket.pending and now - bucket.refilled_at >= bucket.period:
+                    # Idle everywhere; drop it so the key set does not grow forever
+                    del self._buckets[key]
+        self._set_healthy(True)
+
+    def _set_healthy(self, healthy: bool, error: Optional[Exception] = None) -> None:
+        RATE_LIMIT_BACKEND_HEALTHY.set(1 if healthy else 0)
+        if healthy == self.healthy:
+            return
+        self.healthy = healthy
+        if healthy:
+            logger.info("rate_limit_redis_recovered")
+        else:
+            logger.warning("rate_limit_degraded", error=str(error))
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="rate-limit-sync", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.sync_interval)
+            try:
+                self.sync()
+            except Exception as e:
+                log_error(e, {"action": "rate_limit_sync"})
+
+limiter = HybridRateLimiter(redis_client, float(os.getenv("RATE_LIMIT_SYNC_INTERVAL", 1)))
+
+# Who the current Slack request is acting for, used by per-user rate limits
+_identity: contextvars.ContextVar = contextvars.ContextVar("rate_limit_identity", default={})
+
+def set_rate_limit_identity(**identity: Optional[str]) -> None:
+    """Attribute rate-limited calls in the current context, and work it hands to
+    ContextPropagatingExecutor or the job queue, to identity (e.g. user_id)"""
+    _identity.set(identity)
+
+class ContextPropagatingExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that runs each task in a copy of the submitter's context"""
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def _rate_limit_subject(scope: str, signature: Optional[inspect.Signature], args: tuple, kwargs: dict) -> str:
+    """The bucket a call counts against within its scope"""
+    if scope == "global":
+        return "global"
+    if scope == "user":
+        return _identity.get().get("user_id") or "anonymous"
+    if scope == "workspace":
+        workspace_id = signature.bind_partial(*args, **kwargs).arguments.get("workspace_id") if signature else None
+        if workspace_id is None and args:
+            workspace_id = getattr(args[0], "workspace_id", None)
+        return workspace_id or "default"
+    raise ValueError(f"Unknown rate limit scope: {scope}")
+
+def acquire_rate_limit(operation: str, calls: int, period: int, scope: str = "global",
+                       block: bool = False, max_wait: Optional[float] = None,
+                       subject: Optional[str] = None) -> None:
+    """Take one slot from ``operation``'s limit, as ``rate_limit`` does before each call.
+
+    For work that is not one decorated call, such as each item of a bulk
+    create, so it shares the limit of the single-item method. ``subject``
+    defaults to the current user in "user" scope and "global" in global scope.
+    """
+    if subject is None:
+        subject = _rate_limit_subject(scope, None, (), {})
+    key = f"ratelimit:{operation}:{scope}:{subject}"
+    start_time = time.time()
+    waited = False
+    while True:
+        retry_after = limiter.try_acquire(key, calls, period)
+        if not limiter.healthy:
+            RATE_LIMIT_DEGRADED.labels(operation=operation).inc()
+        if not retry_after:
+            break
+        if not block or (max_wait is not None and time.time() + retry_after - start_time > max_wait):
+            RATE_LIMIT_THROTTLED.labels(operation=operation, scope=scope, outcome="rejected").inc()
+            raise RateLimitException(
+                f"Rate limit exceeded: {calls} calls per {period} seconds", retry_after
+            )
+        waited = True
+        time.sleep(retry_after)
+
+    if waited:
+        RATE_LIMIT_THROTTLED.labels(operation=operation, scope=scope, outcome="waited").inc()
+        RATE_LIMIT_WAIT.labels(operation=operation, scope=scope).observe(time.time() - start_time)
+
+def rate_limit(calls: int, period: int, scope: str = "global",
+               block: bool = False, max_wait: Optional[float] = None) -> Callable:
+    """Decorator for rate limiting, shared across replicas through Redis (see HybridRateLimiter).
+
+    Allows ``calls`` per sliding ``period`` seconds for each subject in
+    ``scope``: "global" (all callers on all replicas), "user" (the Slack user
+    set with set_rate_limit_identity) or "workspace" (the call's workspace_id, or
+    the instance's current workspace). Over the limit, the call raises
+    RateLimitException, or with ``block`` waits for a free slot for up to
+    ``max_wait`` seconds (indefinitely if None).
+    """
     def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Create a unique key for this function
-            key = f"ratelimit:{func.__name__}"
-            
-            # Get current count from Redis
-            current = redis_client.get(key)
-            if current is None:
-                redis_client.setex(key, period, 1)
-            elif int(current) >= calls:
-                raise RateLimitException(
-                    f"Rate limit exceeded: {calls} calls per {period} seconds"
-                )
-            else:
-                redis_client.incr(key)
-            
+            acquire_rate_limit(
+                func.__name__, calls, period, scope, block, max_wait,
+                subject=_rate_limit_subject(scope, signature, args, kwargs)
+            )
             return func(*args, **kwargs)
         return wrapper
     return decorator
@@ -4,29 +4,184 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, WebDriverException, SessionNotCreatedException
 from selenium.webdriver.common.keys import Keys
-from typing import Optional, Dict, List, Union
+from typing import Optional, Dict, List, Union, Iterable, Tuple
+from concurrent.futures import Future
 import time
 import os
 from datetime import datetime, timedelta
-from config import NINETY_EMAIL, NINETY_PASSWORD
+from config import (
+    NINETY_EMAIL,
+    NINETY_PASSWORD,
+    NINETY_BROWSER_PROFILE,
+    NINETY_BLOCKED_DOMAINS,
+    NINETY_BROWSER_TABS,
+    NINETY_WAIT_QUIET_PERIOD,
+    NINETY_WAIT_TIMEOUTS,
+    NINETY_SEARCH_CACHE_SIZE,
+    NINETY_SEARCH_CACHE_TTL,
+    NINETY_ITEM_CACHE_SIZE,
+    NINETY_ITEM_CACHE_TTLS,
+    NINETY_SHARED_CACHE_ENABLED,
+    NINETY_INDEX_ENABLED,
+    NINETY_INDEX_PATH,
+    NINETY_INDEX_MAX_AGE,
+    NINETY_DEFAULT_WORKSPACE_ID
+)
+from cache import TTLCache, RedisCache, TieredCache
+from chromedriver import chromedriver_path, invalidate_chromedriver
+from tab_scheduler import TabScheduler
+from single_flight import coalesce
+from thread_export import conversation_header
+from session_store import create_session_store
+from item_index import ItemIndex
+from ninety_backend import NinetyBackend
 import logging
-from functools import lru_cache
 from monitoring import (
     track_timing,
     rate_limit,
+    acquire_rate_limit,
     track_ninety_request,
     log_error,
-    logger
+    logger,
+    redis_client,
+    REQUEST_LATENCY,
+    INDEX_QUERIES,
+    BROWSER_STARTUP_TIME,
+    PAGE_LOAD_TIME,
+    WORKSPACE_SWITCHES
 )
 from selenium.webdriver.support.select import Select
+from ratelimit import RateLimitException
+
+def _search_workspace(key: Tuple) -> str:
+    """Group of a search cache key, so a write drops only its workspace's entries"""
+    return key[2]
+
+# Shared by every NinetyAutomation in the process, and across replicas through
+# Redis when NINETY_SHARED_CACHE_ENABLED is set.
+# search_cache is keyed on (query, item_type, workspace_id), item_cache on (item_id, item_type).
+search_cache = TieredCache(
+    TTLCache("search", maxsize=NINETY_SEARCH_CACHE_SIZE, ttl=NINETY_SEARCH_CACHE_TTL),
+    RedisCache("search", redis_client, group=_search_workspace) if NINETY_SHARED_CACHE_ENABLED else None,
+    group=_search_workspace
+)
+item_cache = TieredCache(
+    TTLCache("item_details", maxsize=NINETY_ITEM_CACHE_SIZE, ttl=max(NINETY_ITEM_CACHE_TTLS.values())),
+    RedisCache("item_details", redis_client) if NINETY_SHARED_CACHE_ENABLED else None
+)
+
+session_store = create_session_store()
+
+# Local full-text index that answers searches without the browser, kept in sync by IndexSyncer
+item_index = ItemIndex(NINETY_INDEX_PATH) if NINETY_INDEX_ENABLED else None
+
+# Real id of the workspace searches without one run in, resolved on first use
+_default_workspace_id: Optional[str] = NINETY_DEFAULT_WORKSPACE_ID
+
+def known_default_workspace() -> Optional[str]:
+    """The id "default" stands for, or None while it has not been resolved yet"""
+    return _default_workspace_id
+
+# Extracts every row matching arguments[0] in one round-trip. arguments[1] maps
+# each output key to [child selector or null for the row itself, attribute name
+# or null for the visible text]; missing elements come back as null.
+_EXTRACT_ROWS_SCRIPT = """
+var fields = arguments[1];
+return Array.prototype.map.call(document.querySelectorAll(arguments[0]), function(row) {
+    var out = {};
+    Object.keys(fields).forEach(function(key) {
+        var node = fields[key][0] ? row.querySelector(fields[key][0]) : row;
+        var attribute = fields[key][1];
+        if (!node) {
+            out[key] = null;
+        } else if (attribute === 'href') {
+            out[key] = node.href;
+        } else {
+            out[key] = attribute ? node.getAttribute(attribute) : node.innerText;
+        }
+    });
+    return out;
+});
+"""
+
+# SessionNotCreatedException text when Chrome and the pinned chromedriver versions differ
+CHROMEDRIVER_MISMATCH_MESSAGE = "only supports Chrome version"
+
+# Per-user limits shared by the decorated single calls and the bulk and tab
+# paths that take slots for each item with acquire_rate_limit
+CREATE_RATE_LIMIT = {"calls": 50, "period": 60, "scope": "user", "block": True, "max_wait": 10}
+SEARCH_RATE_LIMIT = {"calls": 100, "period": 60, "scope": "user"}
+
+SEARCH_RESULT_SELECTOR = "[data-testid='search-result-item']"
+# Rows of the /headlines, /todos and /issues list pages share the search result markup
+LIST_CONTAINER_SELECTOR = "[data-testid='item-list']"
+LIST_ROW_SELECTOR = "[data-testid='item-list-row']"
+LIST_NEXT_PAGE_SELECTOR = "[data-testid='pagination-next']:not([disabled])"
+LIST_MAX_PAGES = 100
+SEARCH_RESULT_FIELDS = {
+    "id": [None, "data-item-id"],
+    "title": ["[data-testid='item-title']", None],
+    "type": [None, "data-item-type"],
+    "description": ["[data-testid='item-description']", None],
+    "url": ["a", "href"],
+    "status": ["[data-testid='item-status']", None],
+    "due_date": ["[data-testid='item-due-date']", None]
+}
+
+ROCK_SELECTOR = ".rock-item"
+ROCK_FIELDS = {
+    "title": [".rock-title", None],
+    "status": [".rock-status", None],
+    "due_date": [".rock-due-date", None],
+    "url": ["a", "href"]
+}
+
+WORKSPACE_SELECTOR = "[data-testid='workspace-item']"
+WORKSPACE_FIELDS = {
+    "id": [None, "data-workspace-id"],
+    "name": ["[data-testid='workspace-name']", None]
+}
+
+# Readiness check for tab operations: true once the navigation started by
+# _start_load has replaced the old document and arguments[0] has rendered.
+_TAB_READY_SCRIPT = """
+return !window.__ninetyLeaving && document.readyState !== 'loading'
+    && document.querySelector(arguments[0]) !== null;
+"""
+
+# Heavy resources the lightweight profile never downloads. Images are also
+# disabled through Chrome preferences; the patterns catch CSS background
+# images and anything served from the tracker domains.
+_BLOCKED_RESOURCE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"
+]
 
-class NinetyAutomation:
-    def __init__(self):
+# Returns [ms since the last DOM mutation, number of elements matching the
+# optional selector], or null while the document is still loading. The
+# observer is installed on first call and lives until the next navigation.
+_PAGE_SETTLE_SCRIPT = """
+if (document.readyState !== 'complete') { return null; }
+if (window.__ninetyLastMutation === undefined) {
+    window.__ninetyLastMutation = Date.now();
+    new MutationObserver(function() { window.__ninetyLastMutation = Date.now(); })
+        .observe(document.body, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+var count = arguments[0] ? document.querySelectorAll(arguments[0]).length : 0;
+return [Date.now() - window.__ninetyLastMutation, count];
+"""
+
+class NinetyAutomation(NinetyBackend):
+    def __init__(self, profile: Optional[str] = None):
         self.driver = None
         self.wait = None
+        self.logged_in = False
+        self.workspace_id = None
+        self.profile = profile or NINETY_BROWSER_PROFILE
+        self._tabs = None
         self.base_url = "https://app.ninety.io"
         self.setup_driver()
         
@@ -41,12 +196,105 @@ class NinetyAutomation:
         chrome_options.add_argument("--headless")  # Run in headless mode by default
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
+        if self.profile == "lightweight":
+            self._apply_lightweight_profile(chrome_options)
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        start_time = time.time()
+        try:
+            self.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=chrome_options)
+        except SessionNotCreatedException as e:
+            # Chrome crashing or failing to start raises this too; only a
+            # version mismatch warrants replacing the pinned driver
+            if CHROMEDRIVER_MISMATCH_MESSAGE not in (e.msg or ""):
+                raise
+            # Chrome was upgraded past the pinned driver; resolve a matching one once
+            logger.info("chromedriver_mismatch")
+            invalidate_chromedriver()
+            self.driver = webdriver.Chrome(service=Service(chromedriver_path()), options=chrome_options)
+        if self.profile == "lightweight":
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {
+                "urls": _BLOCKED_RESOURCE_PATTERNS + [f"*{domain}*" for domain in NINETY_BLOCKED_DOMAINS]
+            })
+        BROWSER_STARTUP_TIME.labels(profile=self.profile).observe(time.time() - start_time)
         self.wait = WebDriverWait(self.driver, 10)
         self.driver.maximize_window()
-        logger.info("webdriver_setup_success")
+        logger.info("webdriver_setup_success", profile=self.profile)
+
+    @staticmethod
+    def _apply_lightweight_profile(chrome_options: Options) -> None:
+        """Trim Chrome down to what scraping needs"""
+        # Return from driver.get at DOMContentLoaded; callers wait for the elements they need
+        chrome_options.page_load_strategy = "eager"
+        for argument in (
+            "--disable-extensions",
+            "--disable-gpu",
+            "--disable-software-rasterizer",
+            "--disable-background-networking",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--blink-settings=imagesEnabled=false"
+        ):
+            chrome_options.add_argument(argument)
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+
+    def _load_page(self, url: str) -> None:
+        """Navigate to url, recording how long the browser took to return"""
+        start_time = time.time()
+        self.driver.get(url)
+        PAGE_LOAD_TIME.labels(profile=self.profile).observe(time.time() - start_time)
+
+    def _start_load(self, url: str) -> None:
+        """Begin navigating the current tab to url without waiting for it"""
+        self.driver.execute_script("window.__ninetyLeaving = true; window.location.href = arguments[0];", url)
+
+    @staticmethod
+    def _loaded(selector: str):
+        """Tab readiness check for a page started with _start_load"""
+        return lambda driver: driver.execute_script(_TAB_READY_SCRIPT, selector)
+
+    def memory_usage(self) -> Optional[int]:
+        """Resident memory in bytes of chromedriver and every Chrome process it started.
+
+        Read from /proc, so returns None on platforms without it.
+        """
+        try:
+            root = self.driver.service.process.pid
+            parents = {}
+            for entry in os.listdir("/proc"):
+                if entry.isdigit():
+                    try:
+                        with open(f"/proc/{entry}/stat") as f:
+                            # The command name may contain spaces, so split after its closing paren
+                            parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+                    except (OSError, IndexError, ValueError):
+                        continue
+        except (AttributeError, OSError):
+            return None
+
+        tree = {root}
+        added = True
+        while added:
+            children = {pid for pid, parent in parents.items() if parent in tree} - tree
+            tree |= children
+            added = bool(children)
+
+        rss = 0
+        for pid in tree:
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            rss += int(line.split()[1]) * 1024
+                            break
+            except (OSError, ValueError):
+                continue
+        return rss
 
     @track_timing("login")
     @rate_limit(calls=10, period=60)  # Limit login attempts
@@ -54,7 +302,7 @@ class NinetyAutomation:
         """Log in to Ninety.io"""
         try:
             track_ninety_request("login", "attempt")
-            self.driver.get(f"{self.base_url}/login")
+            self._load_page(f"{self.base_url}/login")
             
             # Wait for and fill in email
             email_field = self.wait.until(
@@ -76,6 +324,7 @@ class NinetyAutomation:
             )
             track_ninety_request("login", "success")
             logger.info("login_success", email=NINETY_EMAIL)
+            self._save_session()
             return True
         except TimeoutException:
             track_ninety_request("login", "failure")
@@ -87,7 +336,7 @@ class NinetyAutomation:
             raise Exception(f"Login failed: {str(e)}")
 
     @track_timing("create_headline")
-    @rate_limit(calls=50, period=60)
+    @rate_limit(**CREATE_RATE_LIMIT)
     def create_headline(self, title: str, description: Optional[str] = None) -> Dict:
         """Create a new headline in Ninety.io"""
         try:
@@ -95,7 +344,7 @@ class NinetyAutomation:
             self._ensure_logged_in()
             
             # Navigate to headlines section
-            self.driver.get(f"{self.base_url}/headlines")
+            self._load_page(f"{self.base_url}/headlines")
             
             # Click create headline button
             create_button = self.wait.until(
@@ -125,6 +374,7 @@ class NinetyAutomation:
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".success-message"))
             )
             
+            self._invalidate_search_cache()
             track_ninety_request("create_headline", "success")
             return {"title": title, "description": description}
         except Exception as e:
@@ -133,7 +383,7 @@ class NinetyAutomation:
             raise Exception(f"Failed to create headline: {str(e)}")
 
     @track_timing("create_todo")
-    @rate_limit(calls=50, period=60)
+    @rate_limit(**CREATE_RATE_LIMIT)
     def create_todo(self, title: str, description: Optional[str] = None, priority: Optional[str] = None) -> Dict:
         """Create a new to-do in Ninety.io"""
         try:
@@ -141,7 +391,7 @@ class NinetyAutomation:
             self._ensure_logged_in()
             
             # Navigate to todos section
-            self.driver.get(f"{self.base_url}/todos")
+            self._load_page(f"{self.base_url}/todos")
             
             # Click create todo button
             create_button = self.wait.until(
@@ -182,6 +432,7 @@ class NinetyAutomation:
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".success-message"))
             )
             
+            self._invalidate_search_cache()
             track_ninety_request("create_todo", "success")
             return {"title": title, "description": description, "priority": priority}
         except Exception as e:
@@ -190,7 +441,7 @@ class NinetyAutomation:
             raise Exception(f"Failed to create todo: {str(e)}")
 
     @track_timing("create_issue")
-    @rate_limit(calls=50, period=60)
+    @rate_limit(**CREATE_RATE_LIMIT)
     def create_issue(self, title: str, description: Optional[str] = None, 
                     priority: Optional[str] = None, status: Optional[str] = None) -> Dict:
         """Create a new issue in Ninety.io"""
@@ -199,7 +450,7 @@ class NinetyAutomation:
             self._ensure_logged_in()
             
             # Navigate to issues section
-            self.driver.get(f"{self.base_url}/issues")
+            self._load_page(f"{self.base_url}/issues")
             
             # Click create issue button
             create_button = self.wait.until(
@@ -251,6 +502,7 @@ class NinetyAutomation:
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".success-message"))
             )
             
+            self._invalidate_search_cache()
             track_ninety_request("create_issue", "success")
             return {"title": title, "description": description, "priority": priority, "status": status}
         except Exception as e:
@@ -258,25 +510,127 @@ class NinetyAutomation:
             log_error(f"Failed to create issue: {str(e)}", {"action": "create_issue", "title": title})
             raise Exception(f"Failed to create issue: {str(e)}")
 
+    @track_timing("create_items")
+    def create_items(self, item_type: str, titles: List[str]) -> List[Dict]:
+        """Create several headlines, to-dos or issues from one visit to their list page.
+
+        The list page is loaded once and each title goes through the create
+        dialog in turn, without reloading between items. Only a failed item
+        reloads the page, so the next one starts from a clean dialog. Each
+        item counts against the same per-user limit as the single create.
+        """
+        if item_type not in ("headline", "todo", "issue"):
+            return super().create_items(item_type, titles)
+        track_ninety_request("create_items", "attempt")
+        self._ensure_logged_in()
+        list_url = f"{self.base_url}/{item_type}s"
+        self._load_page(list_url)
+
+        outcomes = []
+        for index, title in enumerate(titles):
+            try:
+                acquire_rate_limit(f"create_{item_type}", **CREATE_RATE_LIMIT)
+            except RateLimitException as e:
+                outcomes.append({"title": title, "success": False, "error": str(e)})
+                continue
+            try:
+                self._submit_create_dialog(item_type, title)
+            except Exception as e:
+                track_ninety_request(f"create_{item_type}", "failure")
+                log_error(e, {"action": "create_items", "item_type": item_type, "title": title})
+                outcomes.append({"title": title, "success": False, "error": str(e)})
+                try:
+                    self._load_page(list_url)
+                except Exception as reload_error:
+                    # The browser is unusable; report the remaining items instead of trying them
+                    log_error(reload_error, {"action": "create_items", "item_type": item_type})
+                    outcomes.extend(
+                        {"title": remaining, "success": False, "error": str(reload_error)}
+                        for remaining in titles[index + 1:]
+                    )
+                    break
+            else:
+                track_ninety_request(f"create_{item_type}", "success")
+                outcomes.append({"title": title, "success": True, "error": None})
+
+        if any(outcome["success"] for outcome in outcomes):
+            self._invalidate_search_cache()
+        track_ninety_request("create_items", "success" if all(outcome["success"] for outcome in outcomes) else "failure")
+        logger.info(
+            "items_created", item_type=item_type, requested=len(titles),
+            created=sum(outcome["success"] for outcome in outcomes)
+        )
+        return outcomes
+
+    def _submit_create_dialog(self, item_type: str, title: str) -> None:
+        """Create one item through the create dialog of the list page open in the browser"""
+        previous_messages = self.driver.find_elements(By.CSS_SELECTOR, ".success-message")
+        create_button = self.wait.until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, f"button[data-testid='create-{item_type}-button']"))
+        )
+        create_button.click()
+
+        title_selector = f"input[data-testid='{item_type}-title-input']"
+        title_field = self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, title_selector))
+        )
+        title_field.send_keys(title)
+        self.driver.find_element(By.CSS_SELECTOR, f"button[data-testid='save-{item_type}-button']").click()
+
+        # A toast from the previous item may still be showing, so wait for a new one
+        self.wait.until(lambda driver: [
+            message for message in driver.find_elements(By.CSS_SELECTOR, ".success-message")
+            if message not in previous_messages
+        ])
+        self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, title_selector)))
+
     @track_timing("search_items")
-    @rate_limit(calls=100, period=60)
-    def search_items(self, query: str = "", item_type: Optional[str] = None, workspace_id: Optional[str] = None) -> List[Dict]:
-        """Search for items in Ninety.io with workspace support"""
-        cache_key = f"{query}:{item_type}:{workspace_id}"
-        cached_result = self._get_cached_search(cache_key)
-        if cached_result:
-            return cached_result
-            
+    @rate_limit(**SEARCH_RATE_LIMIT)
+    def search_items(self, query: str = "", item_type: Optional[str] = None, workspace_id: Optional[str] = None,
+                     live: bool = False) -> List[Dict]:
+        """Search for items in Ninety.io with workspace support.
+
+        Answers from the local item index when it is fresh, then from the
+        search cache, and only then drives the browser. ``live`` skips the
+        index and cache and always queries Ninety.io.
+        """
+        # Key caches and the index on the workspace actually searched, never on "default"
+        workspace_id = self._resolve_workspace(workspace_id)
+        cache_key = (query, item_type, workspace_id)
+        if live:
+            INDEX_QUERIES.labels(source="live").inc()
+            results = self._scrape_search_results(query, item_type, workspace_id)
+            search_cache.set(cache_key, results)
+            return results
+        indexed = self._search_index(query, item_type, workspace_id)
+        if indexed is not None:
+            return indexed
+        return search_cache.get_or_compute(
+            cache_key,
+            lambda: self._scrape_search_results(query, item_type, workspace_id)
+        )
+
+    @staticmethod
+    def _search_index(query: str, item_type: Optional[str], workspace_id: str) -> Optional[List[Dict]]:
+        """Results from the local index if it is fresh for this search, else None"""
+        if item_index is not None and item_index.is_fresh(item_type, workspace_id, NINETY_INDEX_MAX_AGE):
+            INDEX_QUERIES.labels(source="index").inc()
+            return item_index.search(query, item_type, workspace_id)
+        INDEX_QUERIES.labels(source="stale").inc()
+        return None
+
+    @coalesce("search_items")
+    def _scrape_search_results(self, query: str, item_type: Optional[str], workspace_id: Optional[str]) -> List[Dict]:
+        """Run a search in the browser and extract the result rows"""
         try:
             track_ninety_request("search_items", "attempt")
             self._ensure_logged_in()
             
-            # Switch workspace if specified
-            if workspace_id and workspace_id != "default":
-                self._switch_workspace(workspace_id)
+            # Always switch: the browser may have been left on another workspace
+            self._switch_workspace(self._resolve_workspace(workspace_id))
             
             # Navigate to search page
-            self.driver.get(f"{self.base_url}/search")
+            self._load_page(f"{self.base_url}/search")
             
             # Enter search query if provided
             if query:
@@ -299,38 +653,14 @@ class NinetyAutomation:
                 type_option.click()
             
             # Wait for results
-            time.sleep(2)  # Allow time for search results to update
+            self._wait_until_settled("search_results", "[data-testid='search-result-item']")
             
             # Extract results
-            results = []
-            result_elements = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "[data-testid='search-result-item']"))
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, SEARCH_RESULT_SELECTOR))
             )
+            results = self._read_search_results()
             
-            for element in result_elements:
-                item = {
-                    "id": element.get_attribute("data-item-id"),
-                    "title": element.find_element(By.CSS_SELECTOR, "[data-testid='item-title']").text,
-                    "type": element.get_attribute("data-item-type"),
-                    "description": element.find_element(By.CSS_SELECTOR, "[data-testid='item-description']").text,
-                    "url": element.find_element(By.CSS_SELECTOR, "a").get_attribute("href")
-                }
-                
-                # Get additional details if available
-                try:
-                    item["status"] = element.find_element(By.CSS_SELECTOR, "[data-testid='item-status']").text
-                except NoSuchElementException:
-                    pass
-                    
-                try:
-                    item["due_date"] = element.find_element(By.CSS_SELECTOR, "[data-testid='item-due-date']").text
-                except NoSuchElementException:
-                    pass
-                
-                results.append(item)
-            
-            # Cache the results
-            self._cache_search_results(cache_key, results)
             track_ninety_request("search_items", "success")
             return results
         except Exception as e:
@@ -343,62 +673,138 @@ class NinetyAutomation:
             })
             raise Exception(f"Failed to search items: {str(e)}")
 
-    @lru_cache(maxsize=100)
-    def _get_cached_search(self, cache_key: str) -> Optional[List[Dict]]:
-        """Get cached search results"""
-        return getattr(self, f"_search_cache_{cache_key}", None)
-
-    def _cache_search_results(self, cache_key: str, results: List[Dict]) -> None:
-        """Cache search results for 5 minutes"""
-        setattr(self, f"_search_cache_{cache_key}", results)
-        # Schedule cache invalidation
-        self._schedule_cache_invalidation(cache_key)
-
-    def _schedule_cache_invalidation(self, cache_key: str) -> None:
-        """Schedule cache invalidation after 5 minutes"""
-        def invalidate():
-            time.sleep(300)  # 5 minutes
-            delattr(self, f"_search_cache_{cache_key}")
-        
-        from threading import Thread
-        Thread(target=invalidate, daemon=True).start()
+    def _read_search_results(self) -> List[Dict]:
+        """Extract the result rows of the search page open in the current tab"""
+        return self._read_item_rows(SEARCH_RESULT_SELECTOR)
+
+    def _read_item_rows(self, row_selector: str) -> List[Dict]:
+        """Extract item rows in the search result markup"""
+        results = []
+        for item in self._extract_rows(row_selector, SEARCH_RESULT_FIELDS):
+            item["title"] = item["title"] or ""
+            item["description"] = item["description"] or ""
+            # Status and due date are only present on some item types
+            for key in ("status", "due_date"):
+                if item[key] is None:
+                    del item[key]
+            results.append(item)
+        return results
+
+    @track_timing("list_items")
+    def list_items(self, item_type: str, workspace_id: Optional[str] = None) -> List[Dict]:
+        """Every headline, to-do or issue of a workspace, read from the type's list page.
+
+        Unlike an empty search, which returns only what the search page
+        shows, this follows the list's pagination to its end, so the result
+        is complete enough for ItemIndex.sync to delete missing rows. An
+        empty list is a valid result. Raises rather than returning a partial
+        listing.
+        """
+        try:
+            track_ninety_request("list_items", "attempt")
+            self._ensure_logged_in()
+            self._switch_workspace(self._resolve_workspace(workspace_id))
+            self._load_page(f"{self.base_url}/{item_type}s")
+            
+            # The container renders even when the list is empty
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, LIST_CONTAINER_SELECTOR))
+            )
+            self._wait_until_settled("list_items", LIST_CONTAINER_SELECTOR)
+            
+            items: Dict[str, Dict] = {}
+            for _ in range(LIST_MAX_PAGES):
+                for item in self._read_item_rows(LIST_ROW_SELECTOR):
+                    item["type"] = item["type"] or item_type
+                    items[item["id"]] = item
+                next_page = self.driver.find_elements(By.CSS_SELECTOR, LIST_NEXT_PAGE_SELECTOR)
+                if not next_page:
+                    track_ninety_request("list_items", "success")
+                    return list(items.values())
+                next_page[0].click()
+                self._wait_until_settled("list_items", LIST_CONTAINER_SELECTOR)
+            raise Exception(f"More than {LIST_MAX_PAGES} pages of {item_type}s")
+        except Exception as e:
+            track_ninety_request("list_items", "failure")
+            log_error(f"Error listing items: {str(e)}", {
+                "action": "list_items",
+                "item_type": item_type,
+                "workspace_id": workspace_id
+            })
+            raise Exception(f"Failed to list {item_type}s: {str(e)}")
+
+    def _invalidate_search_cache(self) -> None:
+        """Drop cached searches of the workspace this browser just changed, or of all
+        workspaces when the browser's workspace is unknown"""
+        workspace_id = self.workspace_id
+        search_cache.invalidate_group(workspace_id)
+        if item_index is not None:
+            item_index.mark_stale(workspace_id)
 
     def attach_conversation(self, item_id: str, item_type: str, conversation_text: str) -> bool:
         """Attach a Slack conversation to a Ninety.io item as a comment."""
+        return self.attach_conversation_parts(item_id, item_type, [conversation_text])
+
+    def attach_conversation_parts(self, item_id: str, item_type: str, parts: List[str]) -> bool:
+        """Attach a conversation split into parts as consecutive comments on one visit to the item"""
+        posted = 0
         try:
             self._ensure_logged_in()
             
             # Navigate to item
             self._navigate_to_item(item_id, item_type)
             
-            # Find and click comment field
-            comment_field = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='comment-field']"))
-            )
-            comment_field.click()
-            
-            # Add header to conversation
-            full_text = f"Slack Conversation (attached {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}):\n\n{conversation_text}"
-            
-            # Input the conversation text
-            comment_field.send_keys(full_text)
-            
-            # Submit comment
-            submit_btn = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='submit-comment']"))
-            )
-            submit_btn.click()
-            
-            # Wait for save confirmation
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='comment-success']"))
-            )
+            attached_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for index, part in enumerate(parts, start=1):
+                # Header space is reserved when the parts are chunked
+                self._post_comment(conversation_header(attached_at, index, len(parts)) + part)
+                posted += 1
             
             return True
         except Exception as e:
             self.logger.error(f"Error attaching conversation: {str(e)}")
+            if posted:
+                raise Exception(
+                    f"Failed to attach conversation to {item_type} after {posted} of {len(parts)} parts: {str(e)}"
+                )
             raise Exception(f"Failed to attach conversation to {item_type}: {str(e)}")
 
+    def _post_comment(self, text: str) -> None:
+        """Post one comment on the item open in the browser"""
+        previous_confirmations = self.driver.find_elements(By.CSS_SELECTOR, "[data-testid='comment-success']")
+        
+        # Find and click comment field
+        comment_field = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='comment-field']"))
+        )
+        self._insert_text(comment_field, text)
+        
+        # Submit comment
+        submit_btn = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='submit-comment']"))
+        )
+        submit_btn.click()
+        
+        # Wait for save confirmation, ignoring any left over from the previous part
+        WebDriverWait(self.driver, 10).until(lambda driver: [
+            confirmation for confirmation in driver.find_elements(By.CSS_SELECTOR, "[data-testid='comment-success']")
+            if confirmation not in previous_confirmations
+        ])
+
+    def _insert_text(self, element, text: str) -> None:
+        """Type text into a field as one insert rather than one key event per character.
+
+        send_keys costs a round of key events per character, which takes
+        seconds for a long thread; Input.insertText delivers the whole text
+        the way a paste would, so the page's input handlers still fire.
+        """
+        element.click()
+        try:
+            self.driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        except WebDriverException:
+            # DevTools unavailable, e.g. a remote driver; fall back to key events
+            element.send_keys(text)
+
     def set_due_date(self, item_id: str, item_type: str, due_date: str) -> bool:
         """Set the due date for a Ninety.io item."""
         try:
@@ -426,6 +832,8 @@ class NinetyAutomation:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='save-success']"))
             )
             
+            self._invalidate_search_cache()
+            item_cache.invalidate((item_id, item_type))
             return True
         except Exception as e:
             self.logger.error(f"Error setting due date: {str(e)}")
@@ -455,53 +863,275 @@ class NinetyAutomation:
             self.logger.error(f"Error subscribing to item: {str(e)}")
             raise Exception(f"Failed to subscribe to {item_type}: {str(e)}")
 
-    @lru_cache(maxsize=100)
     def get_item_details(self, item_id: str, item_type: str) -> Dict:
         """Get detailed information about a Ninety.io item for link unfurling"""
+        return item_cache.get_or_compute(
+            (item_id, item_type),
+            lambda: self._scrape_item_details(item_id, item_type),
+            ttl=NINETY_ITEM_CACHE_TTLS.get(item_type)
+        )
+
+    @coalesce("get_item_details")
+    def _scrape_item_details(self, item_id: str, item_type: str) -> Dict:
+        """Open an item page in the browser and extract its details"""
         try:
             track_ninety_request("get_item_details", "attempt")
             self._ensure_logged_in()
             
             # Navigate to the item
-            self.driver.get(f"{self.base_url}/{item_type}s/{item_id}")
+            self._load_page(f"{self.base_url}/{item_type}s/{item_id}")
             
             # Wait for item details to load
             self.wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".item-details"))
             )
             
-            # Extract item details
-            title = self.driver.find_element(By.CSS_SELECTOR, ".item-title").text
-            description = self.driver.find_element(By.CSS_SELECTOR, ".item-description").text
-            status = self.driver.find_element(By.CSS_SELECTOR, ".item-status").text
-            due_date = self.driver.find_element(By.CSS_SELECTOR, ".due-date").text
-            assignee = self.driver.find_element(By.CSS_SELECTOR, ".assignee").text
-            labels = [label.text for label in self.driver.find_elements(By.CSS_SELECTOR, ".label")]
-            
+            item = self._read_item_details(item_type)
             track_ninety_request("get_item_details", "success")
-            return {
-                "title": title,
-                "description": description,
-                "status": status,
-                "due_date": due_date,
-                "assignee": assignee,
-                "labels": labels,
-                "type": item_type
-            }
+            return item
         except Exception as e:
             track_ninety_request("get_item_details", "failure")
             log_error(f"Failed to get item details: {str(e)}", {"action": "get_item_details", "item_id": item_id})
             raise Exception(f"Failed to get item details: {str(e)}")
 
+    def _read_item_details(self, item_type: str) -> Dict:
+        """Extract the details of the item page open in the current tab"""
+        return {
+            "title": self.driver.find_element(By.CSS_SELECTOR, ".item-title").text,
+            "description": self.driver.find_element(By.CSS_SELECTOR, ".item-description").text,
+            "status": self.driver.find_element(By.CSS_SELECTOR, ".item-status").text,
+            "due_date": self.driver.find_element(By.CSS_SELECTOR, ".due-date").text,
+            "assignee": self.driver.find_element(By.CSS_SELECTOR, ".assignee").text,
+            "labels": [label.text for label in self.driver.find_elements(By.CSS_SELECTOR, ".label")],
+            "type": item_type
+        }
+
+    def _item_details_operation(self, item_id: str, item_type: str):
+        """Tab operation equivalent of _scrape_item_details"""
+        try:
+            self._start_load(f"{self.base_url}/{item_type}s/{item_id}")
+            yield self._loaded(".item-details")
+            item = self._read_item_details(item_type)
+        except Exception as e:
+            track_ninety_request("get_item_details", "failure")
+            log_error(e, {"action": "get_item_details", "item_id": item_id, "tab": True})
+            raise
+        item_cache.set((item_id, item_type), item, ttl=NINETY_ITEM_CACHE_TTLS.get(item_type))
+        track_ninety_request("get_item_details", "success")
+        return item
+
+    def _subscribe_operation(self, item_id: str, item_type: str):
+        """Tab operation equivalent of subscribe_to_item"""
+        item_type_path = {"headline": "headlines", "todo": "todos", "issue": "issues"}.get(item_type.lower())
+        if not item_type_path:
+            raise ValueError(f"Invalid item type: {item_type}")
+        self._start_load(f"{self.base_url}/{item_type_path}/{item_id}")
+        yield self._loaded("[data-testid='item-details']")
+        subscribe_btn = yield EC.element_to_be_clickable((By.CSS_SELECTOR, "[data-testid='subscribe-button']"))
+        subscribe_btn.click()
+        yield EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='subscribed-indicator']"))
+        return True
+
+    def _search_operation(self, query: str, item_type: Optional[str]):
+        """Tab operation equivalent of _scrape_search_results in the current workspace"""
+        self._start_load(f"{self.base_url}/search")
+        yield self._loaded("[data-testid='search-input']")
+        if query:
+            search_field = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='search-input']")
+            search_field.clear()
+            search_field.send_keys(query)
+        if item_type and item_type != "all":
+            type_dropdown = yield EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='type-filter']"))
+            type_dropdown.click()
+            type_option = yield EC.element_to_be_clickable((By.CSS_SELECTOR, f"[data-value='{item_type}']"))
+            type_option.click()
+        yield self._settle_check(SEARCH_RESULT_SELECTOR)
+        return self._read_search_results()
+
+    def _rocks_operation(self, query: Optional[str]):
+        """Tab operation equivalent of search_rocks without a status filter"""
+        self._start_load(f"{self.base_url}/rocks")
+        yield self._loaded(".rocks-list")
+        if query:
+            self.driver.find_element(By.NAME, "search").send_keys(query)
+            yield self._settle_check(ROCK_SELECTOR)
+        return self._extract_rows(ROCK_SELECTOR, ROCK_FIELDS)
+
+    def tab_scheduler(self) -> TabScheduler:
+        """Scheduler spreading operations over up to NINETY_BROWSER_TABS tabs of this browser"""
+        if self._tabs is None:
+            self._tabs = TabScheduler(self.driver, NINETY_BROWSER_TABS)
+        return self._tabs
+
+    def get_item_details_many(self, items: Iterable[Tuple[str, str]],
+                              futures: Optional[Dict[Tuple[str, str], Future]] = None) -> Dict[Tuple[str, str], Future]:
+        """Get details of several (item_id, item_type) pairs, loading uncached ones in parallel tabs.
+
+        Pass futures to have them resolved as each item finishes, e.g. so a
+        caller on another thread can stop waiting at a deadline.
+        """
+        items = list(dict.fromkeys(items))
+        futures = futures if futures is not None else {item: Future() for item in items}
+        operations = {}
+        for item_id, item_type in items:
+            cached = item_cache.get((item_id, item_type))
+            if cached is not None:
+                futures[(item_id, item_type)].set_result(cached)
+            else:
+                operations[(item_id, item_type)] = (
+                    lambda item_id=item_id, item_type=item_type: self._item_details_operation(item_id, item_type)
+                )
+        if operations:
+            self._ensure_logged_in()
+            self.tab_scheduler().run_into(operations, futures)
+        return futures
+
+    def subscribe_to_items(self, items: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Future]:
+        """Subscribe to several (item_id, item_type) pairs using parallel tabs"""
+        self._ensure_logged_in()
+        return self.tab_scheduler().run({
+            (item_id, item_type): lambda item_id=item_id, item_type=item_type: self._subscribe_operation(item_id, item_type)
+            for item_id, item_type in dict.fromkeys(items)
+        })
+
+    def search_items_many(self, searches: Iterable[Tuple[str, Optional[str]]],
+                          workspace_id: Optional[str] = None, live: bool = False,
+                          deadline: Optional[float] = None) -> Dict[Tuple[str, Optional[str]], Future]:
+        """Run several (query, item_type) searches in one workspace using parallel tabs.
+
+        An item_type of "rocks" searches Rocks, always live. Unless ``live``,
+        searches the index or search cache can answer do not touch the
+        browser. Tabs share the browser's workspace, so the workspace is
+        switched once up front rather than per search. Searches unfinished
+        at the absolute ``deadline`` fail with TimeoutException.
+        """
+        self._ensure_logged_in()
+        workspace_id = self._resolve_workspace(workspace_id)
+        futures: Dict[Tuple[str, Optional[str]], Future] = {}
+        pending = []
+        for query, item_type in dict.fromkeys(searches):
+            if item_type == "rocks":
+                pending.append((query, item_type))
+                continue
+            acquire_rate_limit("search_items", **SEARCH_RATE_LIMIT)
+            results = None
+            if not live:
+                results = self._search_index(query, item_type, workspace_id)
+                if results is None:
+                    results = search_cache.get((query, item_type, workspace_id))
+            if results is None:
+                pending.append((query, item_type))
+                continue
+            futures[(query, item_type)] = Future()
+            futures[(query, item_type)].set_result(results)
+        if not pending:
+            return futures
+
+        self._switch_workspace(workspace_id)
+        operations = {}
+        for query, item_type in pending:
+            if item_type == "rocks":
+                operations[(query, item_type)] = lambda query=query: self._rocks_operation(query)
+            else:
+                operations[(query, item_type)] = (
+                    lambda query=query, item_type=item_type: self._search_operation(query, item_type)
+                )
+        scraped = self.tab_scheduler().run(operations, deadline)
+        for (query, item_type), future in scraped.items():
+            if item_type != "rocks" and future.exception() is None:
+                search_cache.set((query, item_type, workspace_id), future.result())
+        futures.update(scraped)
+        return futures
+
     def close(self):
         """Close the browser"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+
+    def is_healthy(self) -> bool:
+        """Check that the browser session is still alive and logged in"""
+        if not self.driver or not self.logged_in:
+            return False
+        process = getattr(self.driver.service, "process", None)
+        if process is not None and process.poll() is not None:
+            # chromedriver itself has exited
+            return False
+        try:
+            # Any round-trip to chromedriver fails fast if the session is gone
+            current_url = self.driver.current_url
+        except WebDriverException:
+            return False
+        if current_url.startswith(f"{self.base_url}/login"):
+            # Ninety.io redirected us to the login form, so the session expired
+            self.logged_in = False
+            return False
+        return True
 
     def _ensure_logged_in(self):
-        """Ensure the user is logged in"""
+        """Ensure the user is logged in, reusing a saved session when possible"""
         if not self.logged_in:
-            self.logged_in = self.login()
+            # A fresh login lands on the default workspace
+            self.workspace_id = None
+            self.logged_in = self._restore_session() or self.login()
+
+    def _save_session(self) -> None:
+        """Persist the current cookies and local storage for the next browser"""
+        if session_store is None:
+            return
+        try:
+            session_store.save({
+                "cookies": self.driver.get_cookies(),
+                "local_storage": self.driver.execute_script(
+                    "return Object.assign({}, window.localStorage);"
+                ),
+                "saved_at": time.time()
+            })
+        except WebDriverException as e:
+            log_error(e, {"action": "save_session"})
+
+    @track_timing("restore_session")
+    def _restore_session(self) -> bool:
+        """Inject a saved session into the browser, returning False if it has expired"""
+        if session_store is None:
+            return False
+        state = session_store.load()
+        if not state:
+            return False
+        try:
+            track_ninety_request("restore_session", "attempt")
+            # Cookies can only be set for the domain currently loaded
+            self._load_page(self.base_url)
+            for cookie in state.get("cookies", []):
+                self.driver.add_cookie(cookie)
+            self.driver.execute_script(
+                "for (var key in arguments[0]) { window.localStorage.setItem(key, arguments[0][key]); }",
+                state.get("local_storage", {})
+            )
+            self._load_page(self.base_url)
+            # Wait for whichever shows: the dashboard, or the login form of an expired session
+            WebDriverWait(self.driver, 5).until(EC.any_of(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".dashboard-container")),
+                EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email']"))
+            ))
+            if not self.driver.find_elements(By.CSS_SELECTOR, "input[type='email']"):
+                track_ninety_request("restore_session", "success")
+                logger.info("session_restored", saved_at=state.get("saved_at"))
+                return True
+            # Only a session Ninety.io has really expired is cleared; the
+            # store may be shared by every replica
+            track_ninety_request("restore_session", "failure")
+            logger.info("session_expired")
+            session_store.clear()
+        except (TimeoutException, WebDriverException) as e:
+            # A slow page or driver hiccup says nothing about the saved session, so keep it
+            track_ninety_request("restore_session", "failure")
+            logger.info("session_restore_failed", error=str(e))
+        try:
+            self.driver.delete_all_cookies()
+        except WebDriverException as e:
+            log_error(e, {"action": "restore_session_reset_cookies"})
+        return False
 
     def _navigate_to_item(self, item_id: str, item_type: str) -> None:
         """Helper method to navigate to a specific item."""
@@ -517,7 +1147,7 @@ class NinetyAutomation:
                 raise ValueError(f"Invalid item type: {item_type}")
             
             item_url = f"https://app.ninety.io/{item_type_path}/{item_id}"
-            self.driver.get(item_url)
+            self._load_page(item_url)
             
             # Wait for page to load
             WebDriverWait(self.driver, 10).until(
@@ -527,7 +1157,7 @@ class NinetyAutomation:
             self.logger.error(f"Error navigating to item: {str(e)}")
             raise Exception(f"Failed to navigate to {item_type}: {str(e)}")
 
-    @lru_cache(maxsize=1)
+    @coalesce("get_workspaces")
     def get_workspaces(self) -> List[Dict]:
         """Get list of available Ninety.io workspaces"""
         try:
@@ -535,21 +1165,13 @@ class NinetyAutomation:
             self._ensure_logged_in()
             
             # Navigate to workspaces page
-            self.driver.get(f"{self.base_url}/workspaces")
+            self._load_page(f"{self.base_url}/workspaces")
             
             # Wait for workspace list to load
-            workspace_elements = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "[data-testid='workspace-item']"))
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, WORKSPACE_SELECTOR))
             )
-            
-            workspaces = []
-            for element in workspace_elements:
-                workspace_id = element.get_attribute("data-workspace-id")
-                workspace_name = element.find_element(By.CSS_SELECTOR, "[data-testid='workspace-name']").text
-                workspaces.append({
-                    "id": workspace_id,
-                    "name": workspace_name
-                })
+            workspaces = self._extract_rows(WORKSPACE_SELECTOR, WORKSPACE_FIELDS)
             
             track_ninety_request("get_workspaces", "success")
             return workspaces
@@ -612,13 +1234,35 @@ class NinetyAutomation:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='success-message']"))
             )
             
+            self._invalidate_search_cache()
+            item_cache.invalidate((item_id, item_type))
             return True
         except Exception as e:
             self.logger.error(f"Error updating item: {str(e)}")
             raise Exception(f"Failed to update {item_type}: {str(e)}")
 
+    def _resolve_workspace(self, workspace_id: Optional[str]) -> str:
+        """Map "default" (or None) to a real workspace id.
+
+        That is NINETY_DEFAULT_WORKSPACE_ID, or else the first workspace
+        listed by Ninety.io, looked up once per process.
+        """
+        global _default_workspace_id
+        if workspace_id and workspace_id != "default":
+            return workspace_id
+        if _default_workspace_id is None:
+            workspaces = self.get_workspaces()
+            if not workspaces:
+                raise Exception("No Ninety.io workspace to search")
+            _default_workspace_id = workspaces[0]["id"]
+            logger.info("default_workspace_resolved", workspace_id=_default_workspace_id)
+        return _default_workspace_id
+
     def _switch_workspace(self, workspace_id: str) -> None:
-        """Switch to a different workspace"""
+        """Switch to a different workspace, unless the browser is already on it"""
+        if workspace_id == self.workspace_id:
+            WORKSPACE_SWITCHES.labels(outcome="skipped").inc()
+            return
         try:
             # Click workspace switcher
             workspace_switcher = WebDriverWait(self.driver, 10).until(
@@ -633,11 +1277,56 @@ class NinetyAutomation:
             workspace_option.click()
             
             # Wait for workspace switch to complete
-            time.sleep(2)  # Allow time for workspace switch
+            self._wait_until_settled("switch_workspace")
+            self.workspace_id = workspace_id
+            WORKSPACE_SWITCHES.labels(outcome="switched").inc()
         except Exception as e:
+            # A half-finished switch leaves the browser on an unknown workspace
+            self.workspace_id = None
             self.logger.error(f"Error switching workspace: {str(e)}")
             raise Exception(f"Failed to switch workspace: {str(e)}")
 
+    def _extract_rows(self, row_selector: str, fields: Dict[str, List[Optional[str]]]) -> List[Dict]:
+        """Collect fields from every matching row with a single execute_script round-trip"""
+        return self.driver.execute_script(_EXTRACT_ROWS_SCRIPT, row_selector, fields)
+
+    @staticmethod
+    def _settle_check(result_selector: Optional[str] = None):
+        """Predicate that turns true once the DOM and the result count have been quiet for the quiet period"""
+        state = {"count": None, "stable_since": time.time()}
+
+        def settled(driver):
+            snapshot = driver.execute_script(_PAGE_SETTLE_SCRIPT, result_selector)
+            if snapshot is None:
+                return False
+            quiet_ms, count = snapshot
+            now = time.time()
+            if count != state["count"]:
+                state["count"] = count
+                state["stable_since"] = now
+            return (quiet_ms >= NINETY_WAIT_QUIET_PERIOD * 1000
+                    and now - state["stable_since"] >= NINETY_WAIT_QUIET_PERIOD)
+
+        return settled
+
+    def _wait_until_settled(self, operation: str, result_selector: Optional[str] = None) -> float:
+        """Wait for the page to stop changing instead of sleeping a fixed time.
+
+        Returns the time actually waited, which is also recorded in
+        REQUEST_LATENCY as ``wait_<operation>``. Hitting the timeout is not
+        an error; the caller carries on with whatever has rendered.
+        """
+        timeout = NINETY_WAIT_TIMEOUTS.get(operation, 10)
+        start_time = time.time()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(self._settle_check(result_selector))
+        except TimeoutException:
+            logger.info("page_settle_timeout", operation=operation, timeout=timeout)
+
+        elapsed = time.time() - start_time
+        REQUEST_LATENCY.labels(type=f"wait_{operation}").observe(elapsed)
+        return elapsed
+
     def __del__(self):
         """Cleanup resources"""
         if self.driver:
@@ -684,10 +1373,11 @@ class NinetyAutomation:
             logger.error(f"Error creating Rock: {str(e)}")
             raise Exception(f"Failed to create Rock: {str(e)}")
 
+    @coalesce("get_rock_details")
     def get_rock_details(self, rock_id):
         """Get details of a specific Rock"""
         try:
-            self.driver.get(f"{self.base_url}/rocks/{rock_id}")
+            self._load_page(f"{self.base_url}/rocks/{rock_id}")
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "rock-details"))
             )
@@ -710,7 +1400,7 @@ class NinetyAutomation:
     def update_rock(self, rock_id, updates):
         """Update a Rock's details"""
         try:
-            self.driver.get(f"{self.base_url}/rocks/{rock_id}")
+            self._load_page(f"{self.base_url}/rocks/{rock_id}")
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "rock-details"))
             )
@@ -756,7 +1446,7 @@ class NinetyAutomation:
     def search_rocks(self, query=None, status=None):
         """Search for Rocks with optional filters"""
         try:
-            self.driver.get(f"{self.base_url}/rocks")
+            self._load_page(f"{self.base_url}/rocks")
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "rocks-list"))
             )
@@ -764,26 +1454,14 @@ class NinetyAutomation:
             if query:
                 search_input = self.driver.find_element(By.NAME, "search")
                 search_input.send_keys(query)
-                time.sleep(1)  # Wait for search results
+                self._wait_until_settled("search_rocks", ".rock-item")
             
             if status:
                 status_filter = Select(self.driver.find_element(By.NAME, "status-filter"))
                 status_filter.select_by_visible_text(status)
-                time.sleep(1)  # Wait for filter to apply
-            
-            rocks = []
-            rock_elements = self.driver.find_elements(By.CLASS_NAME, "rock-item")
-            
-            for element in rock_elements:
-                rock_data = {
-                    "title": element.find_element(By.CLASS_NAME, "rock-title").text,
-                    "status": element.find_element(By.CLASS_NAME, "rock-status").text,
-                    "due_date": element.find_element(By.CLASS_NAME, "rock-due-date").text,
-                    "url": element.find_element(By.TAG_NAME, "a").get_attribute("href")
-                }
-                rocks.append(rock_data)
+                self._wait_until_settled("search_rocks", ".rock-item")
             
-            return rocks
+            return self._extract_rows(ROCK_SELECTOR, ROCK_FIELDS)
             
         except Exception as e:
             logger.error(f"Error searching Rocks: {str(e)}")
@@ -0,0 +1,200 @@
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Optional, Tuple
+from monitoring import BACKEND_FALLBACKS, logger
+
+class UnsupportedOperationError(NotImplementedError):
+    """Raised by a backend for an operation its transport cannot perform"""
+    pass
+
+class NinetyBackend(ABC):
+    """Operations the Slack handlers need from Ninety.io, independent of transport.
+
+    Implemented by NinetyAutomation (browser) and NinetyClient (REST API).
+    Operations that only the browser can perform default to raising
+    UnsupportedOperationError so HybridBackend can route them elsewhere.
+    """
+
+    @abstractmethod
+    def create_headline(self, title: str, description: Optional[str] = None) -> Dict:
+        """Create a new headline"""
+
+    @abstractmethod
+    def create_todo(self, title: str, description: Optional[str] = None, priority: Optional[str] = None) -> Dict:
+        """Create a new to-do"""
+
+    @abstractmethod
+    def create_issue(self, title: str, description: Optional[str] = None,
+                     priority: Optional[str] = None, status: Optional[str] = None) -> Dict:
+        """Create a new issue"""
+
+    @abstractmethod
+    def search_items(self, query: str = "", item_type: Optional[str] = None,
+                     workspace_id: Optional[str] = None, live: bool = False) -> List[Dict]:
+        """Search for headlines, to-dos and issues; live bypasses any local index or cache"""
+
+    def search_items_many(self, searches: Iterable[Tuple[str, Optional[str]]],
+                          workspace_id: Optional[str] = None, live: bool = False,
+                          deadline: Optional[float] = None) -> Dict[Tuple[str, Optional[str]], Future]:
+        """Run several (query, item_type) searches, returning a finished Future per search.
+
+        An item_type of "rocks" searches Rocks. Searches not started by the
+        absolute ``deadline`` fail with TimeoutError. This default runs them
+        one after another; the browser overrides it to share tabs.
+        """
+        futures = {}
+        for query, item_type in dict.fromkeys(searches):
+            future = futures[(query, item_type)] = Future()
+            if deadline is not None and time.time() > deadline:
+                future.set_exception(TimeoutError(f"Search {item_type!r} not started by the deadline"))
+                continue
+            try:
+                if item_type == "rocks":
+                    future.set_result(self.search_rocks(query))
+                else:
+                    future.set_result(self.search_items(query, item_type, workspace_id, live=live))
+            except Exception as e:
+                future.set_exception(e)
+        return futures
+
+    @abstractmethod
+    def get_item_details(self, item_id: str, item_type: str) -> Dict:
+        """Get title, description, status, due date, assignee and labels of an item"""
+
+    @abstractmethod
+    def update_item(self, item_id: str, item_type: str, updates: Dict) -> Any:
+        """Update fields of an existing item"""
+
+    @abstractmethod
+    def attach_conversation(self, item_id: str, item_type: str, conversation_text: str) -> Any:
+        """Add a Slack conversation to an item as a comment"""
+
+    def attach_conversation_parts(self, item_id: str, item_type: str, parts: List[str]) -> bool:
+        """Add a long conversation to an item as consecutive comments, one per part"""
+        for part in parts:
+            self.attach_conversation(item_id, item_type, part)
+        return True
+
+    @abstractmethod
+    def set_due_date(self, item_id: str, item_type: str, due_date: str) -> Any:
+        """Set the due date of an item"""
+
+    def create_items(self, item_type: str, titles: List[str]) -> List[Dict]:
+        """Create several items of one type, reporting each item's outcome.
+
+        Returns one ``{"title", "success", "error"}`` dict per title, in
+        order; a failed item does not stop the rest. Backends that can
+        batch the work override this one-at-a-time default.
+        """
+        create = {
+            "headline": self.create_headline,
+            "todo": self.create_todo,
+            "issue": self.create_issue,
+            "rock": self.create_rock
+        }[item_type]
+        outcomes = []
+        for title in titles:
+            try:
+                create(title)
+            except UnsupportedOperationError:
+                raise
+            except Exception as e:
+                outcomes.append({"title": title, "success": False, "error": str(e)})
+            else:
+                outcomes.append({"title": title, "success": True, "error": None})
+        return outcomes
+
+    def subscribe_to_item(self, item_id: str, item_type: str) -> bool:
+        """Subscribe to notifications for an item"""
+        raise UnsupportedOperationError("subscribe_to_item")
+
+    def get_workspaces(self) -> List[Dict]:
+        """List the available workspaces"""
+        raise UnsupportedOperationError("get_workspaces")
+
+    def create_rock(self, title: str, description: Optional[str] = None, due_date: Optional[str] = None) -> Dict:
+        """Create a new Rock"""
+        raise UnsupportedOperationError("create_rock")
+
+    def get_rock_details(self, rock_id: str) -> Dict:
+        """Get details of a Rock"""
+        raise UnsupportedOperationError("get_rock_details")
+
+    def update_rock(self, rock_id: str, updates: Dict) -> Dict:
+        """Update a Rock"""
+        raise UnsupportedOperationError("update_rock")
+
+    def search_rocks(self, query: Optional[str] = None, status: Optional[str] = None) -> List[Dict]:
+        """Search for Rocks"""
+        raise UnsupportedOperationError("search_rocks")
+
+class HybridBackend(NinetyBackend):
+    """Sends every operation to a primary backend, falling back to a pooled
+    secondary one (the browser) for operations the primary does not support.
+
+    The fallback session is only opened when needed, so API-only requests
+    never check out a browser.
+    """
+
+    def __init__(self, primary: NinetyBackend,
+                 fallback_session: Callable[[], ContextManager[NinetyBackend]]):
+        self.primary = primary
+        self._fallback_session = fallback_session
+
+    def _call(self, operation: str, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return getattr(self.primary, operation)(*args, **kwargs)
+        except UnsupportedOperationError:
+            BACKEND_FALLBACKS.labels(operation=operation).inc()
+            logger.info("backend_fallback", operation=operation)
+            with self._fallback_session() as fallback:
+                return getattr(fallback, operation)(*args, **kwargs)
+
+    def create_headline(self, title, description=None):
+        return self._call("create_headline", title, description)
+
+    def create_todo(self, title, description=None, priority=None):
+        return self._call("create_todo", title, description, priority)
+
+    def create_issue(self, title, description=None, priority=None, status=None):
+        return self._call("create_issue", title, description, priority, status)
+
+    def create_items(self, item_type, titles):
+        return self._call("create_items", item_type, titles)
+
+    def search_items(self, query="", item_type=None, workspace_id=None, live=False):
+        return self._call("search_items", query, item_type, workspace_id, live=live)
+
+    def get_item_details(self, item_id, item_type):
+        return self._call("get_item_details", item_id, item_type)
+
+    def update_item(self, item_id, item_type, updates):
+        return self._call("update_item", item_id, item_type, updates)
+
+    def attach_conversation(self, item_id, item_type, conversation_text):
+        return self._call("attach_conversation", item_id, item_type, conversation_text)
+
+    def attach_conversation_parts(self, item_id, item_type, parts):
+        return self._call("attach_conversation_parts", item_id, item_type, parts)
+
+    def set_due_date(self, item_id, item_type, due_date):
+        return self._call("set_due_date", item_id, item_type, due_date)
+
+    def subscribe_to_item(self, item_id, item_type):
+        return self._call("subscribe_to_item", item_id, item_type)
+
+    def get_workspaces(self):
+        return self._call("get_workspaces")
+
+    def create_rock(self, title, description=None, due_date=None):
+        return self._call("create_rock", title, description, due_date)
+
+    def get_rock_details(self, rock_id):
+        return self._call("get_rock_details", rock_id)
+
+    def update_rock(self, rock_id, updates):
+        return self._call("update_rock", rock_id, updates)
+
+    def search_rocks(self, query=None, status=None):
+        return self._call("search_rocks", query, status)
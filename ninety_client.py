@@ -2,12 +2,13 @@ import requests
 from requests.exceptions import RequestException
 from typing import Optional, Dict, List, Union
 from config import NINETY_API_KEY, NINETY_ORGANIZATION_ID, NINETY_API_BASE_URL
+from ninety_backend import NinetyBackend
 
 class NinetyError(Exception):
     """Base exception for Ninety.io API errors"""
     pass
 
-class NinetyClient:
+class NinetyClient(NinetyBackend):
     def __init__(self):
         self.headers = {
             'Authorization': f'Bearer {NINETY_API_KEY}',
@@ -79,14 +80,17 @@ class NinetyClient:
         }
         return self._make_request('POST', endpoint, json=payload)
 
-    def search_items(self, query: str, item_type: Optional[str] = None,
+    def search_items(self, query: str = "", item_type: Optional[str] = None,
+                    workspace_id: Optional[str] = None,
                     status: Optional[str] = None, priority: Optional[str] = None,
-                    assignee_id: Optional[str] = None, limit: int = 10) -> List[Dict]:
-        """Search for items in Ninety.io with advanced filtering"""
+                    assignee_id: Optional[str] = None, limit: int = 10,
+                    live: bool = True) -> List[Dict]:
+        """Search for items in Ninety.io with advanced filtering (API results are always live)"""
         endpoint = f'/organizations/{NINETY_ORGANIZATION_ID}/search'
         params = {
             'q': query,
             'type': item_type,
+            'workspace_id': workspace_id if workspace_id != 'default' else None,
             'status': status,
             'priority': priority,
             'assignee_id': assignee_id,
@@ -104,6 +108,20 @@ class NinetyClient:
         endpoint = f'/organizations/{NINETY_ORGANIZATION_ID}/{item_type}/{item_id}'
         return self._make_request('GET', endpoint)
 
+    def get_item_details(self, item_id: str, item_type: str) -> Dict:
+        """Get an item in the shape used for Slack unfurls and update modals"""
+        item = self.get_item(item_id, item_type)
+        assignee = item.get('assignee') or {}
+        return {
+            'title': item.get('title', ''),
+            'description': item.get('description') or '',
+            'status': item.get('status') or '',
+            'due_date': item.get('due_date') or '',
+            'assignee': assignee.get('name', '') if isinstance(assignee, dict) else assignee,
+            'labels': item.get('labels') or [],
+            'type': item_type
+        }
+
     def delete_item(self, item_id: str, item_type: str) -> bool:
         """Delete an item from Ninety.io"""
         endpoint = f'/organizations/{NINETY_ORGANIZATION_ID}/{item_type}/{item_id}'
@@ -119,4 +137,14 @@ class NinetyClient:
     def get_comments(self, item_id: str, item_type: str) -> List[Dict]:
         """Get comments for an item in Ninety.io"""
         endpoint = f'/organizations/{NINETY_ORGANIZATION_ID}/{item_type}/{item_id}/comments'
-        return self._make_request('GET', endpoint) 
\ No newline at end of file
+        return self._make_request('GET', endpoint)
+
+    def attach_conversation(self, item_id: str, item_type: str, conversation_text: str) -> bool:
+        """Attach a Slack conversation to an item as a comment"""
+        self.add_comment(item_id, item_type, conversation_text)
+        return True
+
+    def set_due_date(self, item_id: str, item_type: str, due_date: str) -> bool:
+        """Set the due date for an item"""
+        self.update_item(item_id, item_type, {'due_date': due_date})
+        return True
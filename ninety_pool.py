@@ -0,0 +1,298 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional
+from config import (
+    NINETY_POOL_MIN_SIZE,
+    NINETY_POOL_MAX_SIZE,
+    NINETY_POOL_CHECKOUT_TIMEOUT,
+    NINETY_POOL_STANDBY_SIZE,
+    NINETY_POOL_STANDBY_CHECK_INTERVAL,
+    NINETY_POOL_RSS_SAMPLE_INTERVAL
+)
+from ninety_automation import NinetyAutomation, known_default_workspace
+from monitoring import (
+    POOL_WAIT_TIME,
+    POOL_SIZE,
+    POOL_IN_USE,
+    POOL_STANDBY,
+    POOL_WORKER_STARTS,
+    POOL_WORKSPACE_AFFINITY,
+    BROWSER_RSS,
+    log_error,
+    logger
+)
+
+class PoolExhaustedError(Exception):
+    """Raised when no Ninety.io browser worker becomes available in time"""
+    pass
+
+def _create_logged_in_worker() -> NinetyAutomation:
+    """Launch a new browser and log it in to Ninety.io"""
+    worker = NinetyAutomation()
+    try:
+        worker._ensure_logged_in()
+    except Exception:
+        worker.close()
+        raise
+    return worker
+
+class NinetyPool:
+    """Bounded pool of logged-in NinetyAutomation workers.
+
+    Workers are created lazily up to ``max_size`` and handed out one at a
+    time, so each browser only ever serves a single Slack request.
+
+    Up to ``standby_size`` extra workers are kept launched and logged in
+    outside the pool. When a worker crashes or is logged out, its
+    replacement is taken from the standbys instead of being launched
+    inline, and a background thread launches new standbys to take their
+    place.
+
+    Checkouts for a workspace prefer an idle worker whose browser is
+    already on it, so requests alternating between workspaces do not make
+    every browser switch back and forth.
+    """
+
+    def __init__(self, min_size: int = NINETY_POOL_MIN_SIZE,
+                 max_size: int = NINETY_POOL_MAX_SIZE,
+                 checkout_timeout: float = NINETY_POOL_CHECKOUT_TIMEOUT,
+                 factory: Callable[[], NinetyAutomation] = _create_logged_in_worker,
+                 standby_size: int = NINETY_POOL_STANDBY_SIZE,
+                 standby_check_interval: float = NINETY_POOL_STANDBY_CHECK_INTERVAL,
+                 rss_sample_interval: float = NINETY_POOL_RSS_SAMPLE_INTERVAL):
+        if min_size < 0 or max_size < 1 or min_size > max_size or standby_size < 0:
+            raise ValueError(f"Invalid pool bounds: min={min_size}, max={max_size}, standby={standby_size}")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.standby_size = standby_size
+        self.standby_check_interval = standby_check_interval
+        self.rss_sample_interval = rss_sample_interval
+        self._last_rss_sample = 0.0
+        self._factory = factory
+        self._idle: Deque[NinetyAutomation] = deque()
+        self._standby: Deque[NinetyAutomation] = deque()
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._replenish = threading.Event()
+        self._replenisher = None
+
+        for _ in range(min_size):
+            with self._condition:
+                self._size += 1
+            try:
+                worker = self._factory()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                raise
+            with self._condition:
+                self._idle.append(worker)
+        self._update_gauges()
+        if standby_size:
+            self._replenisher = threading.Thread(target=self._replenish_standby, name="ninety-pool-standby", daemon=True)
+            self._replenisher.start()
+        logger.info("ninety_pool_started", min_size=min_size, max_size=max_size, standby_size=standby_size)
+
+    def checkout(self, timeout: Optional[float] = None, workspace_id: Optional[str] = None) -> NinetyAutomation:
+        """Take a healthy worker from the pool, creating one if there is room.
+
+        With ``workspace_id``, an idle worker already on that workspace is
+        preferred over the most recently used one.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        start_time = time.time()
+        deadline = start_time + timeout
+
+        while True:
+            worker = None
+            grow = False
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise PoolExhaustedError("Ninety.io pool is closed")
+                    if self._idle:
+                        worker = self._pop_idle(workspace_id)
+                        break
+                    if self._size < self.max_size:
+                        # Reserve the slot before launching the browser outside the lock
+                        self._size += 1
+                        grow = True
+                        break
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        POOL_WAIT_TIME.observe(time.time() - start_time)
+                        raise PoolExhaustedError(
+                            f"No Ninety.io worker available after {timeout} seconds"
+                        )
+                    self._condition.wait(remaining)
+
+            if grow:
+                worker = self._take_standby()
+                if worker is not None:
+                    POOL_WORKER_STARTS.labels(source="standby").inc()
+                    logger.info("ninety_pool_standby_promoted", size=self._size)
+                else:
+                    try:
+                        worker = self._factory()
+                        POOL_WORKER_STARTS.labels(source="inline").inc()
+                        logger.info("ninety_pool_worker_created", size=self._size)
+                    except Exception:
+                        self._discard(None)
+                        raise
+            elif not worker.is_healthy():
+                logger.info("ninety_pool_worker_unhealthy")
+                self._discard(worker)
+                continue
+
+            with self._condition:
+                self._in_use += 1
+            self._update_gauges()
+            POOL_WAIT_TIME.observe(time.time() - start_time)
+            return worker
+
+    def checkin(self, worker: NinetyAutomation, healthy: bool = True) -> None:
+        """Return a worker to the pool, discarding it if it is no longer usable"""
+        with self._condition:
+            self._in_use -= 1
+        if not healthy or self._closed:
+            self._discard(worker)
+            return
+        self._sample_rss(worker)
+        with self._condition:
+            self._idle.append(worker)
+            self._condition.notify()
+        self._update_gauges()
+
+    def _sample_rss(self, worker: NinetyAutomation) -> None:
+        """Record the worker's memory at most once per rss_sample_interval across the pool.
+
+        memory_usage walks /proc, which is too slow to do on every checkin.
+        """
+        with self._condition:
+            now = time.time()
+            if now - self._last_rss_sample < self.rss_sample_interval:
+                return
+            self._last_rss_sample = now
+        rss = worker.memory_usage()
+        if rss is not None:
+            BROWSER_RSS.labels(profile=worker.profile).observe(rss)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None,
+                workspace_id: Optional[str] = None) -> Iterator[NinetyAutomation]:
+        """Check out a worker for the duration of a ``with`` block"""
+        worker = self.checkout(timeout, workspace_id)
+        try:
+            yield worker
+        except Exception:
+            self.checkin(worker, healthy=worker.is_healthy())
+            raise
+        else:
+            self.checkin(worker)
+
+    def close(self) -> None:
+        """Shut down every idle and standby worker and refuse further checkouts"""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            standby = list(self._standby)
+            self._standby.clear()
+            self._condition.notify_all()
+        self._replenish.set()
+        for worker in idle:
+            self._discard(worker)
+        for worker in standby:
+            self._close_standby(worker)
+        self._update_gauges()
+        logger.info("ninety_pool_closed")
+
+    def _pop_idle(self, workspace_id: Optional[str]) -> NinetyAutomation:
+        """Remove an idle worker, preferring one already on workspace_id (caller holds the lock)"""
+        if not workspace_id or workspace_id == "default":
+            # Searches switch to the real default workspace, so prefer a worker already there
+            workspace_id = known_default_workspace()
+            if workspace_id is None:
+                return self._idle.pop()
+        for worker in reversed(self._idle):
+            if worker.workspace_id == workspace_id:
+                self._idle.remove(worker)
+                POOL_WORKSPACE_AFFINITY.labels(outcome="hit").inc()
+                return worker
+        POOL_WORKSPACE_AFFINITY.labels(outcome="miss").inc()
+        return self._idle.pop()
+
+    def _take_standby(self) -> Optional[NinetyAutomation]:
+        """Hand over a healthy standby worker, if there is one, and ask for a replacement"""
+        while True:
+            with self._condition:
+                worker = self._standby.popleft() if self._standby else None
+            if worker is None:
+                return None
+            self._replenish.set()
+            self._update_gauges()
+            if worker.is_healthy():
+                return worker
+            logger.info("ninety_pool_standby_unhealthy")
+            self._close_standby(worker)
+
+    def _replenish_standby(self) -> None:
+        """Background loop keeping standby_size healthy standbys launched"""
+        while not self._closed:
+            self._replenish.clear()
+            with self._condition:
+                standby = list(self._standby)
+            for worker in standby:
+                if not worker.is_healthy():
+                    with self._condition:
+                        if worker not in self._standby:
+                            continue
+                        self._standby.remove(worker)
+                    logger.info("ninety_pool_standby_unhealthy")
+                    self._close_standby(worker)
+
+            while not self._closed and len(self._standby) < self.standby_size:
+                try:
+                    worker = self._factory()
+                except Exception as e:
+                    log_error(e, {"action": "ninety_pool_standby_launch"})
+                    break
+                with self._condition:
+                    closed = self._closed
+                    if not closed:
+                        self._standby.append(worker)
+                if closed:
+                    self._close_standby(worker)
+                    return
+                logger.info("ninety_pool_standby_ready", standby=len(self._standby))
+                self._update_gauges()
+
+            self._replenish.wait(self.standby_check_interval)
+
+    def _close_standby(self, worker: NinetyAutomation) -> None:
+        try:
+            worker.close()
+        except Exception as e:
+            log_error(e, {"action": "ninety_pool_standby_close"})
+
+    def _discard(self, worker: Optional[NinetyAutomation]) -> None:
+        """Close a worker and free its slot for a replacement"""
+        if worker is not None:
+            try:
+                worker.close()
+            except Exception as e:
+                log_error(e, {"action": "ninety_pool_discard"})
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        POOL_SIZE.set(self._size)
+        POOL_IN_USE.set(self._in_use)
+        POOL_STANDBY.set(len(self._standby))
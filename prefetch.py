@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, ContextManager, Dict, Iterable, Tuple
+from monitoring import PREFETCHES, log_error
+from single_flight import coalesce_checkout
+
+class Prefetcher:
+    """Speculatively loads item details a user is likely to open next.
+
+    Each user has at most one batch in flight. Starting a new batch, or
+    opening one of the prefetched items, cancels whatever has not started
+    and counts the unused prefetches as wasted, so hit and waste ratios
+    can be read from the ``ninety_prefetches_total`` metric.
+    """
+
+    def __init__(self, session_factory: Callable[[], ContextManager], max_workers: int, top_n: int):
+        self._session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ninety-prefetch")
+        self.top_n = top_n
+        self._batches: Dict[str, Dict[Tuple[str, str], Future]] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, owner: str, items: Iterable[Tuple[str, str]]) -> None:
+        """Start loading details for the first top_n (item_id, item_type) pairs"""
+        self.cancel(owner)
+        batch = {}
+        for item_id, item_type in items:
+            if len(batch) >= self.top_n:
+                break
+            if (item_id, item_type) in batch:
+                continue
+            batch[(item_id, item_type)] = self._executor.submit(self._load, item_id, item_type)
+            PREFETCHES.labels(outcome="issued").inc()
+        with self._lock:
+            self._batches[owner] = batch
+
+    def record_use(self, owner: str, item_id: str, item_type: str) -> bool:
+        """Note that owner opened an item, returning whether it had been prefetched"""
+        with self._lock:
+            batch = self._batches.pop(owner, {})
+        future = batch.pop((item_id, item_type), None)
+        hit = future is not None and future.done() and not future.cancelled() and future.exception() is None
+        if future is not None:
+            PREFETCHES.labels(outcome="hit" if hit else "late").inc()
+        self._discard(batch)
+        return hit
+
+    def cancel(self, owner: str) -> None:
+        """Abandon owner's outstanding batch"""
+        with self._lock:
+            batch = self._batches.pop(owner, {})
+        self._discard(batch)
+
+    def _discard(self, batch: Dict[Tuple[str, str], Future]) -> None:
+        for future in batch.values():
+            PREFETCHES.labels(outcome="cancelled" if future.cancel() else "wasted").inc()
+
+    def _load(self, item_id: str, item_type: str) -> None:
+        try:
+            # Populates the shared item cache that get_item_details reads from
+            coalesce_checkout(
+                "get_item_details", (item_id, item_type), self._session_factory,
+                lambda ninety: ninety.get_item_details(item_id, item_type)
+            )
+        except Exception as e:
+            PREFETCHES.labels(outcome="failed").inc()
+            log_error(e, {"action": "prefetch_item", "item_id": item_id, "item_type": item_type})
+            raise
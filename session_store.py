@@ -0,0 +1,112 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from cryptography.fernet import Fernet, InvalidToken
+from config import NINETY_SESSION_STORE, NINETY_SESSION_FILE, NINETY_SESSION_KEY
+from monitoring import redis_client, log_error, logger
+
+REDIS_SESSION_KEY = "ninety:session"
+
+class SessionStore(ABC):
+    """Encrypted storage for an authenticated Ninety.io browser session.
+
+    The saved state holds the browser's cookies and local storage so a new
+    browser can skip the login form. Subclasses only move opaque encrypted
+    tokens around; anything unreadable is treated as no saved session.
+    """
+
+    def __init__(self, key: str):
+        self._fernet = Fernet(key.encode())
+
+    def load(self) -> Optional[Dict]:
+        """Return the saved session state, or None if there is none usable"""
+        try:
+            token = self._read()
+        except Exception as e:
+            log_error(e, {"action": "session_store_load"})
+            return None
+        if not token:
+            return None
+        try:
+            return json.loads(self._fernet.decrypt(token.encode()))
+        except (InvalidToken, ValueError):
+            logger.info("session_store_unreadable")
+            self.clear()
+            return None
+
+    def save(self, state: Dict) -> None:
+        """Encrypt and persist the session state"""
+        token = self._fernet.encrypt(json.dumps(state).encode()).decode()
+        try:
+            self._write(token)
+        except Exception as e:
+            log_error(e, {"action": "session_store_save"})
+
+    def clear(self) -> None:
+        """Forget the saved session"""
+        try:
+            self._delete()
+        except Exception as e:
+            log_error(e, {"action": "session_store_clear"})
+
+    @abstractmethod
+    def _read(self) -> Optional[str]:
+        """Return the stored token, or None if nothing is stored"""
+
+    @abstractmethod
+    def _write(self, token: str) -> None:
+        """Store the token, replacing any previous one"""
+
+    @abstractmethod
+    def _delete(self) -> None:
+        """Remove the stored token"""
+
+class FileSessionStore(SessionStore):
+    """Session state kept in a local file readable only by the current user"""
+
+    def __init__(self, key: str, path: str):
+        super().__init__(key)
+        self.path = path
+
+    def _read(self) -> Optional[str]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return f.read()
+
+    def _write(self, token: str) -> None:
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(token)
+        os.replace(tmp_path, self.path)
+
+    def _delete(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class RedisSessionStore(SessionStore):
+    """Session state kept in Redis so every replica can reuse one login"""
+
+    def _read(self) -> Optional[str]:
+        return redis_client.get(REDIS_SESSION_KEY)
+
+    def _write(self, token: str) -> None:
+        redis_client.set(REDIS_SESSION_KEY, token)
+
+    def _delete(self) -> None:
+        redis_client.delete(REDIS_SESSION_KEY)
+
+def create_session_store() -> Optional[SessionStore]:
+    """Build the configured session store, or None if persistence is disabled"""
+    if NINETY_SESSION_STORE == "none":
+        return None
+    if not NINETY_SESSION_KEY:
+        logger.info("session_store_disabled", reason="NINETY_SESSION_KEY not set")
+        return None
+    if NINETY_SESSION_STORE == "redis":
+        return RedisSessionStore(NINETY_SESSION_KEY)
+    if NINETY_SESSION_STORE == "file":
+        return FileSessionStore(NINETY_SESSION_KEY, NINETY_SESSION_FILE)
+    raise ValueError(f"Invalid NINETY_SESSION_STORE: {NINETY_SESSION_STORE}")
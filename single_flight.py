@@ -0,0 +1,81 @@
+import threading
+from functools import wraps
+from typing import Any, Callable, ContextManager, Dict, Hashable, Optional
+from monitoring import COALESCED_CALLS
+
+class _Call:
+    """One in-flight execution that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Collapses concurrent identical calls into one execution.
+
+    The first caller for a key (the leader) runs the function; callers
+    arriving while it is in flight block and receive the leader's result or
+    exception. Nothing is remembered once the call finishes, so this only
+    deduplicates simultaneous work; caching is left to the caches.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, operation: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            COALESCED_CALLS.labels(operation=operation, role="follower").inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        COALESCED_CALLS.labels(operation=operation, role="leader").inc()
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+flights = SingleFlight()
+
+def coalesce_checkout(operation: str, key: Hashable, session_factory: Callable[[], ContextManager],
+                      run: Callable[[Any], Any]) -> Any:
+    """Run ``run`` on a session from ``session_factory``, sharing it between concurrent identical calls.
+
+    Unlike coalesce, followers wait before a browser is checked out, so
+    they do not hold one idle while the leader works.
+    """
+    def leader() -> Any:
+        with session_factory() as session:
+            return run(session)
+    return flights.do(operation, ("checkout", operation, key), leader)
+
+def coalesce(operation: str) -> Callable:
+    """Decorator sharing one execution of a method between concurrent calls with the same arguments.
+
+    The instance is not part of the key, so identical calls made through
+    different browser workers are coalesced too. Followers here already hold
+    a browser; entry points coalesce earlier (see coalesce_checkout and
+    Job.coalesce_key) so this only catches races between them.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            key = (operation, args, tuple(sorted(kwargs.items())))
+            return flights.do(operation, key, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
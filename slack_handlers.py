@@ -1,22 +1,335 @@
 from slack_bolt import Bolt
 from slack_bolt.adapter.socket_mode import SocketModeHandler
-from config import SLACK_BOT_TOKEN, SLACK_SIGNING_SECRET
-from ninety_automation import NinetyAutomation
+from config import (
+    SLACK_BOT_TOKEN,
+    SLACK_SIGNING_SECRET,
+    NINETY_POOL_MAX_SIZE,
+    NINETY_SEARCH_DEADLINE,
+    NINETY_UNFURL_DEADLINE,
+    NINETY_UNFURL_LATE_DEADLINE,
+    NINETY_JOB_WORKERS,
+    NINETY_JOB_QUEUE_SIZE,
+    NINETY_BACKEND,
+    NINETY_PREFETCH_TOP_N,
+    NINETY_PREFETCH_WORKERS,
+    NINETY_PREFETCH_CHECKOUT_TIMEOUT,
+    NINETY_BROWSER_TABS,
+    NINETY_WORKSPACE_REFRESH_INTERVAL,
+    NINETY_BULK_CREATE_MAX_ITEMS
+)
+from ninety_pool import NinetyPool
+from ninety_backend import HybridBackend
+from ninety_client import NinetyClient
+from prefetch import Prefetcher
+from job_queue import JobQueue, Job, JobQueueFullError, JOB_CREATE, JOB_UPDATE, JOB_ATTACH, JOB_SEARCH
+from single_flight import coalesce_checkout
+from workspaces import WorkspaceDirectory
+from thread_export import export_thread, format_messages, chunk_messages
+from monitoring import (
+    log_error,
+    logger,
+    set_rate_limit_identity,
+    ContextPropagatingExecutor,
+    MODAL_FIRST_PAINT,
+    MODAL_READY
+)
+from slack_sdk.errors import SlackApiError
+from selenium.common.exceptions import TimeoutException as TabTimeoutException
+import json
 import re
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import Future, wait
 from typing import Dict, List, Optional
 from datetime import datetime
 
-# Initialize the Slack Bolt app
-app = Bolt(token=SLACK_BOT_TOKEN, signing_secret=SLACK_SIGNING_SECRET)
-ninety = None
+# Initialize the Slack Bolt app. Listeners run on a context-propagating
+# executor so the identity set by attach_rate_limit_identity reaches them.
+app = Bolt(
+    token=SLACK_BOT_TOKEN,
+    signing_secret=SLACK_SIGNING_SECRET,
+    listener_executor=ContextPropagatingExecutor(max_workers=5, thread_name_prefix="slack-listener")
+)
+ninety_pool = None
+_ninety_pool_lock = threading.Lock()
+api_backend = None
+prefetcher = None
+_prefetcher_lock = threading.Lock()
+job_queue = None
+_job_queue_lock = threading.Lock()
+# Runs the concurrent per-item lookups behind link unfurling
+_fanout_executor = ContextPropagatingExecutor(max_workers=NINETY_POOL_MAX_SIZE, thread_name_prefix="ninety-fanout")
 
-def get_ninety_instance():
-    """Get or create a Ninety.io automation instance"""
-    global ninety
-    if ninety is None:
-        ninety = NinetyAutomation()
-        ninety.login()
-    return ninety
+@app.middleware
+def attach_rate_limit_identity(context, next):
+    """Count rate-limited Ninety.io calls made for this request against the Slack user.
+
+    Bolt runs listeners after the middleware chain returns, so the identity
+    is left set on the dispatching thread, where every request replaces it,
+    and is copied from there into the listener executor.
+    """
+    set_rate_limit_identity(user_id=context.user_id, team_id=context.team_id)
+    next()
+
+def get_ninety_pool():
+    """Get or create the shared pool of Ninety.io automation workers"""
+    global ninety_pool
+    if ninety_pool is None:
+        with _ninety_pool_lock:
+            if ninety_pool is None:
+                ninety_pool = NinetyPool()
+    return ninety_pool
+
+def browser_session(timeout=None, workspace_id=None):
+    """Check out a logged-in Ninety.io automation worker for a ``with`` block,
+    preferring one already on workspace_id"""
+    return get_ninety_pool().session(timeout, workspace_id)
+
+def get_api_backend():
+    """Get or create the REST API backend, which borrows a browser only for unsupported operations"""
+    global api_backend
+    if api_backend is None:
+        api_backend = HybridBackend(NinetyClient(), browser_session)
+    return api_backend
+
+def ninety_session(timeout=None, workspace_id=None):
+    """Get a Ninety.io backend for a ``with`` block, as selected by NINETY_BACKEND"""
+    if NINETY_BACKEND == "api":
+        return nullcontext(get_api_backend())
+    return browser_session(timeout, workspace_id)
+
+# Workspaces offered by the workspace pickers, refreshed in the background (started by app.py)
+workspace_directory = WorkspaceDirectory(ninety_session, NINETY_WORKSPACE_REFRESH_INTERVAL)
+
+def get_job_queue():
+    """Get or create the background queue that runs Ninety.io jobs"""
+    global job_queue
+    if job_queue is None:
+        with _job_queue_lock:
+            if job_queue is None:
+                job_queue = JobQueue(ninety_session, workers=NINETY_JOB_WORKERS, maxsize=NINETY_JOB_QUEUE_SIZE)
+    return job_queue
+
+def get_prefetcher():
+    """Get or create the item detail prefetcher"""
+    global prefetcher
+    if prefetcher is None:
+        with _prefetcher_lock:
+            if prefetcher is None:
+                prefetcher = Prefetcher(
+                    lambda: ninety_session(timeout=NINETY_PREFETCH_CHECKOUT_TIMEOUT),
+                    max_workers=NINETY_PREFETCH_WORKERS,
+                    top_n=NINETY_PREFETCH_TOP_N
+                )
+    return prefetcher
+
+def enqueue_ninety_job(kind, run, on_success, on_failure, workspace_id=None, deadline=None,
+                       coalesce_key=None, max_retries=None):
+    """Queue Ninety.io work so the handler returns without waiting on the browser.
+
+    ``run`` receives a pooled NinetyAutomation, one already on
+    ``workspace_id`` if possible; its result is passed to ``on_success`` and
+    any final error to ``on_failure``, both called from a job worker thread.
+    The browser is waited for no later than the absolute ``deadline``. Reads
+    with the same ``coalesce_key`` (starting with the operation name) share
+    one run. ``max_retries`` overrides the default for ``kind``.
+    """
+    try:
+        get_job_queue().submit(Job(kind, run, on_success, on_failure, max_retries=max_retries,
+                                   workspace_id=workspace_id, deadline=deadline, coalesce_key=coalesce_key))
+    except JobQueueFullError as e:
+        on_failure(e)
+
+def message_view(title, text):
+    """Modal showing a single line of text, used for loading, empty and error states"""
+    return {
+        "type": "modal",
+        "title": {"type": "plain_text", "text": title},
+        "blocks": [
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": text}
+            }
+        ]
+    }
+
+def record_first_paint(modal, started_at):
+    """Record how long the user waited before the modal showed anything"""
+    MODAL_FIRST_PAINT.labels(modal=modal).observe(time.time() - started_at)
+
+def fill_modal(client, modal, started_at, view_id, view_hash, kind, run, build_view, title, error_text,
+               workspace_id=None, coalesce_key=None):
+    """Second phase of a two-phase modal: load its data on the job queue, then
+    replace the loading view with ``build_view(result)``.
+
+    ``view_hash`` is the hash of the loading view where known. If the user
+    has changed the view since, Slack rejects the update with hash_conflict
+    and the stale result is dropped.
+    """
+    def update(view):
+        try:
+            client.views_update(view_id=view_id, hash=view_hash, view=view)
+            return True
+        except SlackApiError as e:
+            if e.response.get("error") != "hash_conflict":
+                raise
+            logger.info("modal_update_superseded", modal=modal)
+            return False
+    
+    def on_failure(e):
+        update(message_view(title, f"❌ {error_text}: {str(e)}"))
+    
+    def on_success(result):
+        # Anything failing here would otherwise leave the modal loading forever
+        try:
+            ready = update(build_view(result))
+        except Exception as e:
+            log_error(e, {"action": "fill_modal", "modal": modal})
+            on_failure(e)
+            return
+        if ready:
+            MODAL_READY.labels(modal=modal).observe(time.time() - started_at)
+    
+    enqueue_ninety_job(
+        kind,
+        run,
+        on_success=on_success,
+        on_failure=on_failure,
+        workspace_id=workspace_id,
+        coalesce_key=coalesce_key
+    )
+
+def create_item_by_type(ninety, item_type, title):
+    """Create a headline, todo or issue with just a title"""
+    if item_type == "headline":
+        return ninety.create_headline(title)
+    elif item_type == "todo":
+        return ninety.create_todo(title)
+    return ninety.create_issue(title)
+
+# List markers stripped from the start of each line of a bulk create
+_LIST_MARKER = re.compile(r"^\s*(?:(?:[-*•]|\d+[.)]|\[[ xX]?\])\s+)*")
+
+# Slack rejects views whose private_metadata is longer than this
+SLACK_PRIVATE_METADATA_LIMIT = 3000
+
+def parse_bulk_titles(text):
+    """One title per non-empty line, without bullets, numbering or checkboxes"""
+    titles = [_LIST_MARKER.sub("", line).strip() for line in text.splitlines()]
+    return [title for title in titles if title]
+
+def bulk_metadata(metadata, lines):
+    """Serialise modal metadata with the bulk create lines.
+
+    The lines are shortened only if the whole would exceed Slack's
+    private_metadata limit; the indices of shortened lines are recorded
+    under "shortened" so the summary can say so.
+    """
+    limit = max((len(line) for line in lines), default=0)
+    while True:
+        shortened = [i for i, line in enumerate(lines) if len(line) > limit]
+        text = json.dumps(
+            {**metadata, "lines": [line[:limit] for line in lines], "shortened": shortened},
+            ensure_ascii=False
+        )
+        if len(text) <= SLACK_PRIVATE_METADATA_LIMIT or limit <= 1:
+            return text
+        limit = int(limit * 0.9)
+
+def bulk_create_summary(item_type, outcomes, shortened=()):
+    """One message reporting every item of a bulk create, noting titles that were shortened"""
+    created = sum(outcome["success"] for outcome in outcomes)
+    lines = [f"Created {created} of {len(outcomes)} {item_type}s:"]
+    for i, outcome in enumerate(outcomes):
+        note = " _(title shortened)_" if i in shortened else ""
+        if outcome["success"]:
+            lines.append(f"✅ {outcome['title']}{note}")
+        else:
+            lines.append(f"❌ {outcome['title']}{note}: {outcome['error']}")
+    return "\n".join(lines)
+
+def enqueue_bulk_create(item_type, titles, notify, notify_error, shortened=()):
+    """Create all titles on one pooled browser and report them in one message.
+
+    ``shortened`` holds the indices of titles that were cut to fit the modal metadata.
+    """
+    if len(titles) > NINETY_BULK_CREATE_MAX_ITEMS:
+        notify_error(f"❌ Too many items ({len(titles)}); at most {NINETY_BULK_CREATE_MAX_ITEMS} can be created at once")
+        return
+    enqueue_ninety_job(
+        JOB_CREATE,
+        lambda ninety: ninety.create_items(item_type, titles),
+        on_success=lambda outcomes: notify(bulk_create_summary(item_type, outcomes, set(shortened))),
+        on_failure=lambda e: notify_error(f"❌ Error creating {item_type}s: {str(e)}")
+    )
+
+def fetch_item_details(targets):
+    """Start loading details for (item_type, item_id) pairs, returning a Future per pair.
+
+    With the browser backend the items share one pooled browser and load in
+    parallel tabs; otherwise each item is fetched on its own worker.
+    """
+    if NINETY_BACKEND != "browser" or NINETY_BROWSER_TABS < 2 or len(targets) < 2:
+        return {
+            (item_type, item_id): _fanout_executor.submit(
+                coalesce_checkout,
+                "get_item_details", (item_id, item_type), ninety_session,
+                lambda ninety, item_type=item_type, item_id=item_id: ninety.get_item_details(item_id, item_type)
+            )
+            for item_type, item_id in targets
+        }
+    
+    by_item = {(item_id, item_type): Future() for item_type, item_id in targets}
+    
+    def load_in_tabs():
+        try:
+            with browser_session() as ninety:
+                ninety.get_item_details_many(by_item, by_item)
+        except Exception as e:
+            for future in by_item.values():
+                if not future.done():
+                    future.set_exception(e)
+    
+    _fanout_executor.submit(load_in_tabs)
+    return {(item_type, item_id): future for (item_id, item_type), future in by_item.items()}
+
+def search_all_types(ninety, query, deadline=None, live=False):
+    """Search headlines, todos, issues and rocks on one backend.
+
+    With the browser all four searches share its tabs, and item searches
+    the index or cache can answer skip the browser. ``deadline`` is the
+    absolute time.time() the searches must finish by, NINETY_SEARCH_DEADLINE
+    from now by default.
+
+    Returns a tuple of (results by type, types that missed the deadline).
+    Lookups that fail are logged and reported as empty; if every lookup
+    fails the first error is raised.
+    """
+    if deadline is None:
+        deadline = time.time() + NINETY_SEARCH_DEADLINE
+    item_types = ["headlines", "todos", "issues", "rocks"]
+    futures = ninety.search_items_many(
+        [(query, item_type) for item_type in item_types], live=live, deadline=deadline
+    )
+    lookups = {item_type: futures[(query, item_type)] for item_type in item_types}
+    
+    results = {item_type: [] for item_type in lookups}
+    errors = []
+    timed_out = []
+    for item_type, future in lookups.items():
+        error = future.exception()
+        if error is None:
+            results[item_type] = future.result()
+        elif isinstance(error, (TabTimeoutException, TimeoutError)):
+            timed_out.append(item_type)
+        else:
+            log_error(error, {"action": "search_all_types", "item_type": item_type, "query": query})
+            errors.append(error)
+    
+    if errors and len(errors) == len(lookups):
+        raise errors[0]
+    return results, timed_out
 
 def create_item_modal(item_type, trigger_id, initial_text=None):
     """Create a modal for item creation"""
@@ -106,19 +419,20 @@ def handle_create_headline_submission(ack, body, client):
     values = body["view"]["state"]["values"]
     title = values["title"]["title_input"]["value"]
     description = values["description"]["description_input"]["value"]
+    user_id = body["user"]["id"]
     
-    try:
-        ninety = get_ninety_instance()
-        result = ninety.create_headline(title, description)
-        client.chat_postMessage(
-            channel=body["user"]["id"],
+    enqueue_ninety_job(
+        JOB_CREATE,
+        lambda ninety: ninety.create_headline(title, description),
+        on_success=lambda result: client.chat_postMessage(
+            channel=user_id,
             text=f"✅ Headline created successfully!\nTitle: {result['title']}"
-        )
-    except Exception as e:
-        client.chat_postMessage(
-            channel=body["user"]["id"],
+        ),
+        on_failure=lambda e: client.chat_postMessage(
+            channel=user_id,
             text=f"❌ Error creating headline: {str(e)}"
         )
+    )
 
 @app.view("create_todo")
 def handle_create_todo_submission(ack, body, client):
@@ -127,19 +441,20 @@ def handle_create_todo_submission(ack, body, client):
     title = values["title"]["title_input"]["value"]
     description = values["description"]["description_input"]["value"]
     priority = values["priority"]["priority_select"]["selected_option"]["value"]
+    user_id = body["user"]["id"]
     
-    try:
-        ninety = get_ninety_instance()
-        result = ninety.create_todo(title, description, priority)
-        client.chat_postMessage(
-            channel=body["user"]["id"],
+    enqueue_ninety_job(
+        JOB_CREATE,
+        lambda ninety: ninety.create_todo(title, description, priority),
+        on_success=lambda result: client.chat_postMessage(
+            channel=user_id,
             text=f"✅ To-do created successfully!\nTitle: {result['title']}\nPriority: {priority}"
-        )
-    except Exception as e:
-        client.chat_postMessage(
-            channel=body["user"]["id"],
+        ),
+        on_failure=lambda e: client.chat_postMessage(
+            channel=user_id,
             text=f"❌ Error creating to-do: {str(e)}"
         )
+    )
 
 @app.view("create_issue")
 def handle_create_issue_submission(ack, body, client):
@@ -149,164 +464,116 @@ def handle_create_issue_submission(ack, body, client):
     description = values["description"]["description_input"]["value"]
     priority = values["priority"]["priority_select"]["selected_option"]["value"]
     status = values["status"]["status_select"]["selected_option"]["value"]
+    user_id = body["user"]["id"]
     
-    try:
-        ninety = get_ninety_instance()
-        result = ninety.create_issue(title, description, priority, status)
-        client.chat_postMessage(
-            channel=body["user"]["id"],
+    enqueue_ninety_job(
+        JOB_CREATE,
+        lambda ninety: ninety.create_issue(title, description, priority, status),
+        on_success=lambda result: client.chat_postMessage(
+            channel=user_id,
             text=f"✅ Issue created successfully!\nTitle: {result['title']}\nPriority: {priority}\nStatus: {status}"
-        )
-    except Exception as e:
-        client.chat_postMessage(
-            channel=body["user"]["id"],
+        ),
+        on_failure=lambda e: client.chat_postMessage(
+            channel=user_id,
             text=f"❌ Error creating issue: {str(e)}"
         )
+    )
 
 @app.action("search_items")
 def handle_search_items(ack, body, client):
     ack()
-    # Open a modal for search
-    modal = {
-        "type": "modal",
-        "callback_id": "search_items",
-        "title": {"type": "plain_text", "text": "Search Ninety.io Items"},
-        "submit": {"type": "plain_text", "text": "Search"},
-        "blocks": [
-            {
-                "type": "input",
-                "block_id": "search_query",
-                "label": {"type": "plain_text", "text": "Search Query"},
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "search_input"
+    # Same modal as the search shortcut, so its submission takes the two-phase path
+    create_search_modal(body["trigger_id"], client)
+
+def build_unfurl_blocks(item, item_type, item_id):
+    """Build the rich preview blocks for a Ninety.io item link"""
+    return [
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*{item['title']}*\n{item['description'][:100]}..."
+            }
+        },
+        {
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"Type: {item['type'].title()} | Status: {item['status']} | Due: {item['due_date']}"
                 }
-            },
-            {
-                "type": "input",
-                "block_id": "item_type",
-                "label": {"type": "plain_text", "text": "Item Type"},
-                "element": {
-                    "type": "static_select",
-                    "action_id": "type_select",
-                    "placeholder": {"type": "plain_text", "text": "Select type"},
-                    "options": [
-                        {"text": {"type": "plain_text", "text": "All"}, "value": None},
-                        {"text": {"type": "plain_text", "text": "Headlines"}, "value": "headline"},
-                        {"text": {"type": "plain_text", "text": "To-dos"}, "value": "todo"},
-                        {"text": {"type": "plain_text", "text": "Issues"}, "value": "issue"}
-                    ]
+            ]
+        },
+        {
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {"type": "plain_text", "text": "Subscribe"},
+                    "action_id": f"subscribe_{item_type}_{item_id}"
+                },
+                {
+                    "type": "button",
+                    "text": {"type": "plain_text", "text": "Set Due Date"},
+                    "action_id": f"set_due_date_{item_type}_{item_id}"
+                },
+                {
+                    "type": "button",
+                    "text": {"type": "plain_text", "text": "Attach Conversation"},
+                    "action_id": f"attach_conversation_{item_type}_{item_id}"
                 }
-            }
-        ]
-    }
-    client.views_open(trigger_id=body["trigger_id"], view=modal)
-
-@app.view("search_items")
-def handle_search_submission(ack, body, client):
-    ack()
-    values = body["view"]["state"]["values"]
-    query = values["search_query"]["search_input"]["value"]
-    item_type = values["item_type"]["type_select"]["selected_option"]["value"]
-    
-    try:
-        ninety = get_ninety_instance()
-        results = ninety.search_items(query, item_type)
-        if not results:
-            client.chat_postMessage(
-                channel=body["user"]["id"],
-                text="No items found matching your search."
-            )
-            return
-        
-        # Format results
-        message = "🔍 Search Results:\n\n"
-        for item in results[:5]:  # Limit to 5 results
-            message += f"• {item['title']}\n"
-            if item.get('description'):
-                message += f"  {item['description'][:100]}...\n"
-            message += f"  Type: {item['type']}\n"
-            if item.get('priority'):
-                message += f"  Priority: {item['priority']}\n"
-            if item.get('status'):
-                message += f"  Status: {item['status']}\n"
-            message += "\n"
-        
-        client.chat_postMessage(
-            channel=body["user"]["id"],
-            text=message
-        )
-    except Exception as e:
-        client.chat_postMessage(
-            channel=body["user"]["id"],
-            text=f"❌ Error searching items: {str(e)}"
-        )
+            ]
+        }
+    ]
 
 @app.event("link_shared")
 def handle_link_shared(event, client):
-    """Handle shared Ninety.io links"""
+    """Handle shared Ninety.io links.
+
+    Each distinct item is fetched once, concurrently (see fetch_item_details). Everything ready by
+    NINETY_UNFURL_DEADLINE is unfurled in a single chat_unfurl call and any
+    slower links follow in one more call, up to NINETY_UNFURL_LATE_DEADLINE
+    later; links still loading then are left without a preview.
+    """
+    # Map each distinct (item_type, item_id) to every URL that points at it
+    targets = {}
     for link in event.get("links", []):
         if "ninety.io" in link["url"]:
             # Extract item type and ID from URL
             match = re.search(r"ninety\.io/(\w+)/(\w+)", link["url"])
             if match:
-                item_type, item_id = match.groups()
-                try:
-                    ninety = get_ninety_instance()
-                    item = ninety.get_item_details(item_id, item_type)
-                    
-                    # Create unfurl blocks
-                    blocks = [
-                        {
-                            "type": "section",
-                            "text": {
-                                "type": "mrkdwn",
-                                "text": f"*{item['title']}*\n{item['description'][:100]}..."
-                            }
-                        },
-                        {
-                            "type": "context",
-                            "elements": [
-                                {
-                                    "type": "mrkdwn",
-                                    "text": f"Type: {item['type'].title()} | Status: {item['status']} | Due: {item['due_date']}"
-                                }
-                            ]
-                        },
-                        {
-                            "type": "actions",
-                            "elements": [
-                                {
-                                    "type": "button",
-                                    "text": {"type": "plain_text", "text": "Subscribe"},
-                                    "action_id": f"subscribe_{item_type}_{item_id}"
-                                },
-                                {
-                                    "type": "button",
-                                    "text": {"type": "plain_text", "text": "Set Due Date"},
-                                    "action_id": f"set_due_date_{item_type}_{item_id}"
-                                },
-                                {
-                                    "type": "button",
-                                    "text": {"type": "plain_text", "text": "Attach Conversation"},
-                                    "action_id": f"attach_conversation_{item_type}_{item_id}"
-                                }
-                            ]
-                        }
-                    ]
-                    
-                    # Unfurl the link
-                    client.chat_unfurl(
-                        channel=event["channel"],
-                        ts=event["message_ts"],
-                        unfurls={
-                            link["url"]: {
-                                "blocks": blocks
-                            }
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error unfurling link: {str(e)}")
+                targets.setdefault(match.groups(), set()).add(link["url"])
+    if not targets:
+        return
+    
+    futures = {future: target for target, future in fetch_item_details(targets).items()}
+    
+    def post_unfurls(done):
+        unfurls = {}
+        for future in done:
+            item_type, item_id = futures[future]
+            try:
+                item = future.result()
+            except Exception as e:
+                log_error(e, {"action": "unfurl_link", "item_type": item_type, "item_id": item_id})
+                continue
+            blocks = build_unfurl_blocks(item, item_type, item_id)
+            for url in targets[(item_type, item_id)]:
+                unfurls[url] = {"blocks": blocks}
+        if unfurls:
+            client.chat_unfurl(
+                channel=event["channel"],
+                ts=event["message_ts"],
+                unfurls=unfurls
+            )
+    
+    done, pending = wait(futures, timeout=NINETY_UNFURL_DEADLINE)
+    post_unfurls(done)
+    if pending:
+        done, pending = wait(pending, timeout=NINETY_UNFURL_LATE_DEADLINE)
+        post_unfurls(done)
+        if pending:
+            logger.info("unfurl_dropped", count=len(pending))
 
 @app.command("/ninety")
 def handle_ninety_command(ack, command, client):
@@ -321,13 +588,13 @@ def handle_ninety_command(ack, command, client):
 *Ninety.io Commands*
 • `/ninety help` - Show this help message
 • `/ninety create [headline|todo|issue|rock] [title]` - Create a new item
-• `/ninety search [query]` - Search for items
+• `/ninety search [query] [--live]` - Search for items (`--live` bypasses the local index)
 • `/ninety list [headlines|todos|issues|rocks]` - List recent items
 • `/ninety subscribe [item-id]` - Subscribe to item updates
 • `/ninety due [item-id] [date]` - Set or view due dates
 
 *Quick Commands*
-• `/ninety-create` - Create new items
+• `/ninety-create` - Create new items (one per line to create several at once)
 • `/ninety-search` - Search items
 • `/ninety-list` - List recent items
 • `/ninety-rock` - Create a new Rock
@@ -391,44 +658,53 @@ def handle_ninety_create_command(ack, command, client):
         )
         return
     
-    try:
-        ninety = get_ninety_instance()
-        if item_type == "headline":
-            result = ninety.create_headline(title)
-        elif item_type == "todo":
-            result = ninety.create_todo(title)
-        else:
-            result = ninety.create_issue(title)
-        
-        client.chat_postMessage(
+    # One item per line creates them all in a single browser session
+    titles = parse_bulk_titles(title)
+    if len(titles) > 1:
+        enqueue_bulk_create(
+            item_type, titles,
+            notify=lambda text: client.chat_postMessage(channel=command["channel_id"], text=text),
+            notify_error=lambda text: client.chat_postEphemeral(
+                channel=command["channel_id"],
+                user=command["user_id"],
+                text=text
+            )
+        )
+        return
+    
+    enqueue_ninety_job(
+        JOB_CREATE,
+        lambda ninety: create_item_by_type(ninety, item_type, title),
+        on_success=lambda result: client.chat_postMessage(
             channel=command["channel_id"],
             text=f"✅ Created {item_type}: {result['title']}\n{result.get('url', '')}"
-        )
-    except Exception as e:
-        client.chat_postEphemeral(
+        ),
+        on_failure=lambda e: client.chat_postEphemeral(
             channel=command["channel_id"],
             user=command["user_id"],
             text=f"❌ Error creating {item_type}: {str(e)}"
         )
+    )
 
 @app.command("/ninety-search")
 def handle_ninety_search_command(ack, command, client):
     """Handle the /ninety-search command"""
     ack()
     
-    query = command["text"].strip()
-    try:
-        ninety = get_ninety_instance()
-        
-        # Search across all item types including Rocks
-        results = {
-            "headlines": ninety.search_items(query, "headlines"),
-            "todos": ninety.search_items(query, "todos"),
-            "issues": ninety.search_items(query, "issues"),
-            "rocks": ninety.search_rocks(query)
-        }
-        
-        if not any(results.values()):
+    # "--live" skips the local index and cache and queries Ninety.io directly
+    words = command["text"].split()
+    live = "--live" in words
+    query = " ".join(word for word in words if word != "--live")
+    # One deadline covers queueing, checkout and every search
+    deadline = time.time() + NINETY_SEARCH_DEADLINE
+    
+    def search(ninety):
+        # Search across all item types including Rocks on one browser
+        return search_all_types(ninety, query, deadline=deadline, live=live)
+    
+    def post_results(found):
+        results, timed_out = found
+        if not any(results.values()) and not timed_out:
             client.chat_postEphemeral(
                 channel=command["channel_id"],
                 user=command["user_id"],
@@ -465,17 +741,37 @@ def handle_ninety_search_command(ack, command, client):
                         }
                     })
         
+        if timed_out:
+            blocks.append({
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"⏱ Timed out searching {', '.join(timed_out)} - showing partial results"
+                    }
+                ]
+            })
+        
         client.chat_postEphemeral(
             channel=command["channel_id"],
             user=command["user_id"],
             blocks=blocks
         )
-    except Exception as e:
-        client.chat_postEphemeral(
+    
+    # Not retried: a retry could only start after the deadline
+    enqueue_ninety_job(
+        JOB_SEARCH,
+        search,
+        on_success=post_results,
+        on_failure=lambda e: client.chat_postEphemeral(
             channel=command["channel_id"],
             user=command["user_id"],
             text=f"❌ Error searching items: {str(e)}"
-        )
+        ),
+        deadline=deadline,
+        coalesce_key=("search_all_types", query, live),
+        max_retries=0
+    )
 
 @app.command("/ninety-list")
 def handle_ninety_list_command(ack, command, client):
@@ -493,10 +789,7 @@ def handle_ninety_list_command(ack, command, client):
         )
         return
     
-    try:
-        ninety = get_ninety_instance()
-        results = ninety.search_items("", item_type if item_type != "all" else None)
-        
+    def post_results(results):
         if not results:
             client.chat_postEphemeral(
                 channel=command["channel_id"],
@@ -535,12 +828,18 @@ def handle_ninety_list_command(ack, command, client):
             user=command["user_id"],
             blocks=blocks
         )
-    except Exception as e:
-        client.chat_postEphemeral(
+    
+    enqueue_ninety_job(
+        JOB_SEARCH,
+        lambda ninety: ninety.search_items("", item_type if item_type != "all" else None),
+        on_success=post_results,
+        on_failure=lambda e: client.chat_postEphemeral(
             channel=command["channel_id"],
             user=command["user_id"],
             text=f"❌ Error listing items: {str(e)}"
-        )
+        ),
+        coalesce_key=("search_items", "", item_type if item_type != "all" else None, None)
+    )
 
 @app.command("/ninety-subscribe")
 def handle_ninety_subscribe_command(ack, command, client):
@@ -556,30 +855,33 @@ def handle_ninety_subscribe_command(ack, command, client):
         )
         return
     
-    try:
-        ninety = get_ninety_instance()
-        # Extract item type from ID prefix (e.g., HDL-123 -> headline)
-        item_type = {
-            "HDL": "headline",
-            "TODO": "todo",
-            "ISS": "issue"
-        }.get(item_id.split("-")[0], None)
-        
-        if not item_type:
-            raise ValueError("Invalid item ID format")
-        
-        result = ninety.subscribe_to_item(item_id, item_type)
-        
-        client.chat_postMessage(
-            channel=command["channel_id"],
-            text=f"✅ Subscribed to {item_type} {item_id}"
-        )
-    except Exception as e:
+    def post_error(e):
         client.chat_postEphemeral(
             channel=command["channel_id"],
             user=command["user_id"],
             text=f"❌ Error subscribing to item: {str(e)}"
         )
+    
+    # Extract item type from ID prefix (e.g., HDL-123 -> headline)
+    item_type = {
+        "HDL": "headline",
+        "TODO": "todo",
+        "ISS": "issue"
+    }.get(item_id.split("-")[0], None)
+    
+    if not item_type:
+        post_error(ValueError("Invalid item ID format"))
+        return
+    
+    enqueue_ninety_job(
+        JOB_UPDATE,
+        lambda ninety: ninety.subscribe_to_item(item_id, item_type),
+        on_success=lambda result: client.chat_postMessage(
+            channel=command["channel_id"],
+            text=f"✅ Subscribed to {item_type} {item_id}"
+        ),
+        on_failure=post_error
+    )
 
 @app.command("/ninety-due")
 def handle_ninety_due_command(ack, command, client):
@@ -598,37 +900,48 @@ def handle_ninety_due_command(ack, command, client):
     item_id = args[0]
     due_date = args[1] if len(args) > 1 else None
     
-    try:
-        ninety = get_ninety_instance()
-        # Extract item type from ID prefix
-        item_type = {
-            "HDL": "headline",
-            "TODO": "todo",
-            "ISS": "issue"
-        }.get(item_id.split("-")[0], None)
-        
-        if not item_type:
-            raise ValueError("Invalid item ID format")
-        
-        if due_date:
-            # Set due date
-            result = ninety.update_item(item_id, item_type, {"due_date": due_date})
-            message = f"✅ Set due date for {item_type} {item_id} to {due_date}"
-        else:
-            # Get current due date
-            item = ninety.get_item_details(item_id, item_type)
-            message = f"Due date for {item_type} {item_id}: {item.get('due_date', 'Not set')}"
-        
-        client.chat_postMessage(
-            channel=command["channel_id"],
-            text=message
-        )
-    except Exception as e:
+    def post_error(e):
         client.chat_postEphemeral(
             channel=command["channel_id"],
             user=command["user_id"],
             text=f"❌ Error managing due date: {str(e)}"
         )
+    
+    # Extract item type from ID prefix
+    item_type = {
+        "HDL": "headline",
+        "TODO": "todo",
+        "ISS": "issue"
+    }.get(item_id.split("-")[0], None)
+    
+    if not item_type:
+        post_error(ValueError("Invalid item ID format"))
+        return
+    
+    if due_date:
+        # Set due date
+        enqueue_ninety_job(
+            JOB_UPDATE,
+            lambda ninety: ninety.update_item(item_id, item_type, {"due_date": due_date}),
+            on_success=lambda result: client.chat_postMessage(
+                channel=command["channel_id"],
+                text=f"✅ Set due date for {item_type} {item_id} to {due_date}"
+            ),
+            on_failure=post_error
+        )
+        return
+    
+    # Get current due date
+    enqueue_ninety_job(
+        JOB_SEARCH,
+        lambda ninety: ninety.get_item_details(item_id, item_type),
+        on_success=lambda item: client.chat_postMessage(
+            channel=command["channel_id"],
+            text=f"Due date for {item_type} {item_id}: {item.get('due_date', 'Not set')}"
+        ),
+        on_failure=post_error,
+        coalesce_key=("get_item_details", item_id, item_type)
+    )
 
 @app.command("/ninety-rock")
 def handle_ninety_rock_command(ack, command, client):
@@ -647,20 +960,19 @@ def handle_ninety_rock_command(ack, command, client):
     title = args[0]
     description = args[1] if len(args) > 1 else None
     
-    try:
-        ninety = get_ninety_instance()
-        result = ninety.create_rock(title, description)
-        
-        client.chat_postMessage(
+    enqueue_ninety_job(
+        JOB_CREATE,
+        lambda ninety: ninety.create_rock(title, description),
+        on_success=lambda result: client.chat_postMessage(
             channel=command["channel_id"],
             text=f"✅ Created Rock: {result['title']}\n{result.get('url', '')}"
-        )
-    except Exception as e:
-        client.chat_postEphemeral(
+        ),
+        on_failure=lambda e: client.chat_postEphemeral(
             channel=command["channel_id"],
             user=command["user_id"],
             text=f"❌ Error creating Rock: {str(e)}"
         )
+    )
 
 def handle_create_command(command, client, args):
     """Helper function to handle /ninety create"""
@@ -672,6 +984,8 @@ def handle_create_command(command, client, args):
         )
         return
     
+    # Drop the subcommand but keep the newlines of a multi-line list
+    command["text"] = command["text"].strip().split(maxsplit=1)[1]
     handle_ninety_create_command(lambda: None, command, client)
 
 def handle_search_command(command, client, args):
@@ -720,8 +1034,10 @@ def handle_create_issue_shortcut(ack, shortcut, client):
 
 @app.shortcut("search_items_shortcut")
 def handle_search_items_shortcut(ack, shortcut, client):
+    started_at = time.time()
     ack()
     create_search_modal(shortcut["trigger_id"], client)
+    record_first_paint("search_form", started_at)
 
 @app.event("app_mention")
 def handle_app_mention(event, client):
@@ -750,35 +1066,36 @@ def handle_app_mention(event, client):
             if item_type not in ["headline", "todo", "issue"]:
                 raise ValueError("Invalid item type")
             
-            ninety = get_ninety_instance()
-            if item_type == "headline":
-                result = ninety.create_headline(title)
-            elif item_type == "todo":
-                result = ninety.create_todo(title)
-            else:
-                result = ninety.create_issue(title)
-                
-            client.chat_postMessage(
-                channel=channel_id,
-                text=f"✅ Created {item_type}: {result['title']}"
+            enqueue_ninety_job(
+                JOB_CREATE,
+                lambda ninety: create_item_by_type(ninety, item_type, title),
+                on_success=lambda result: client.chat_postMessage(
+                    channel=channel_id,
+                    text=f"✅ Created {item_type}: {result['title']}"
+                ),
+                on_failure=lambda e: client.chat_postMessage(
+                    channel=channel_id,
+                    text=f"❌ Error creating {item_type}: {str(e)}"
+                )
             )
         except Exception as e:
             client.chat_postMessage(
                 channel=channel_id,
-                text=f"❌ Error creating {item_type}: {str(e)}"
+                text=f"❌ Error creating item: {str(e)}"
             )
     
     elif command == "search":
         # Handle search command
-        try:
-            ninety = get_ninety_instance()
-            results = ninety.search_items(args)
-            format_and_send_results(results, client, channel_id)
-        except Exception as e:
-            client.chat_postMessage(
+        enqueue_ninety_job(
+            JOB_SEARCH,
+            lambda ninety: ninety.search_items(args),
+            on_success=lambda results: format_and_send_results(results, client, channel_id),
+            on_failure=lambda e: client.chat_postMessage(
                 channel=channel_id,
                 text=f"❌ Error searching: {str(e)}"
-            )
+            ),
+            coalesce_key=("search_items", args, None, None)
+        )
     
     elif command == "help":
         show_help(client, channel_id)
@@ -797,18 +1114,18 @@ def handle_subscribe_action(ack, body, client):
     match = re.match(r"subscribe_(\w+)_(\w+)", body["action_id"])
     if match:
         item_type, item_id = match.groups()
-        try:
-            ninety = get_ninety_instance()
-            result = ninety.subscribe_to_item(item_id, item_type)
-            client.chat_postMessage(
+        enqueue_ninety_job(
+            JOB_UPDATE,
+            lambda ninety: ninety.subscribe_to_item(item_id, item_type),
+            on_success=lambda result: client.chat_postMessage(
                 channel=body["user"]["id"],
                 text=f"✅ Subscribed to {item_type} successfully!"
-            )
-        except Exception as e:
-            client.chat_postMessage(
+            ),
+            on_failure=lambda e: client.chat_postMessage(
                 channel=body["user"]["id"],
                 text=f"❌ Error subscribing to {item_type}: {str(e)}"
             )
+        )
 
 @app.action("set_due_date_.*")
 def handle_set_due_date_action(ack, body, client):
@@ -845,29 +1162,33 @@ def handle_attach_conversation_action(ack, body, client):
     match = re.match(r"attach_conversation_(\w+)_(\w+)", body["action_id"])
     if match:
         item_type, item_id = match.groups()
+        message = body["message"]
         try:
-            # Get conversation history
-            result = client.conversations_history(
-                channel=body["channel"]["id"],
-                latest=body["message"]["ts"],
-                limit=5,
-                inclusive=True
-            )
-            
-            # Format conversation
-            messages = result["messages"]
-            conversation_text = ""
-            for msg in reversed(messages):
-                user_info = client.users_info(user=msg["user"])["user"]
-                conversation_text += f"{user_info['real_name']}: {msg['text']}\n"
+            if message.get("thread_ts") or message.get("reply_count"):
+                # The whole thread, however long, split into comment-sized parts
+                parts = export_thread(client, body["channel"]["id"], message.get("thread_ts", message["ts"]))
+            else:
+                # Get conversation history
+                result = client.conversations_history(
+                    channel=body["channel"]["id"],
+                    latest=message["ts"],
+                    limit=5,
+                    inclusive=True
+                )
+                parts = chunk_messages(format_messages(client, reversed(result["messages"])))
             
             # Attach conversation to item
-            ninety = get_ninety_instance()
-            ninety.attach_conversation(item_id, item_type, conversation_text)
-            
-            client.chat_postMessage(
-                channel=body["user"]["id"],
-                text=f"✅ Conversation attached to {item_type} successfully!"
+            enqueue_ninety_job(
+                JOB_ATTACH,
+                lambda ninety: ninety.attach_conversation_parts(item_id, item_type, parts),
+                on_success=lambda result: client.chat_postMessage(
+                    channel=body["user"]["id"],
+                    text=f"✅ Conversation attached to {item_type} successfully!"
+                ),
+                on_failure=lambda e: client.chat_postMessage(
+                    channel=body["user"]["id"],
+                    text=f"❌ Error attaching conversation: {str(e)}"
+                )
             )
         except Exception as e:
             client.chat_postMessage(
@@ -887,15 +1208,7 @@ def create_search_modal(trigger_id, client, initial_type=None):
                 "type": "input",
                 "block_id": "workspace",
                 "label": {"type": "plain_text", "text": "Workspace"},
-                "element": {
-                    "type": "static_select",
-                    "action_id": "workspace_select",
-                    "placeholder": {"type": "plain_text", "text": "Select workspace"},
-                    "options": [
-                        {"text": {"type": "plain_text", "text": workspace}, "value": workspace_id}
-                        for workspace_id, workspace in get_workspaces()
-                    ]
-                }
+                "element": workspace_select_element()
             },
             {
                 "type": "input",
@@ -928,33 +1241,38 @@ def create_search_modal(trigger_id, client, initial_type=None):
     }
     client.views_open(trigger_id=trigger_id, view=modal)
 
-def get_workspaces():
-    """Get list of Ninety.io workspaces"""
-    try:
-        ninety = get_ninety_instance()
-        workspaces = ninety.get_workspaces()
-        return [(w["id"], w["name"]) for w in workspaces]
-    except Exception as e:
-        return [("default", "Default Workspace")]  # Fallback if can't fetch workspaces
+def workspace_select_element():
+    """Workspace picker whose options are loaded on demand by handle_workspace_options"""
+    return {
+        "type": "external_select",
+        "action_id": "workspace_select",
+        "placeholder": {"type": "plain_text", "text": "Select workspace"},
+        "min_query_length": 0
+    }
+
+@app.options("workspace_select")
+def handle_workspace_options(ack, body):
+    """Serve workspace picker options from the cached workspace directory"""
+    ack(options=[
+        {"text": {"type": "plain_text", "text": workspace}, "value": workspace_id}
+        for workspace_id, workspace in workspace_directory.search(body.get("value", ""))
+    ])
 
 @app.view("search_items")
 def handle_search_submission(ack, body, client):
-    ack()
+    started_at = time.time()
     values = body["view"]["state"]["values"]
     workspace_id = values["workspace"]["workspace_select"]["selected_option"]["value"]
     item_type = values["item_type"]["type_select"]["selected_option"]["value"]
     query = values.get("search_query", {}).get("search_input", {}).get("value", "")
     
-    try:
-        ninety = get_ninety_instance()
-        results = ninety.search_items(query, item_type, workspace_id)
-        
+    # Swap the form for a loading view right away, then fill it from a job
+    ack(response_action="update", view=message_view("Select Item", ":hourglass_flowing_sand: Searching Ninety.io..."))
+    record_first_paint("search_results", started_at)
+    
+    def build_results(results):
         if not results:
-            client.chat_postMessage(
-                channel=body["user"]["id"],
-                text="No items found matching your search."
-            )
-            return
+            return message_view("Select Item", "No items found matching your search.")
         
         # Create blocks for item selection
         blocks = [
@@ -979,104 +1297,122 @@ def handle_search_submission(ack, body, client):
                 }
             })
         
-        client.views_push(
-            trigger_id=body["trigger_id"],
-            view={
-                "type": "modal",
-                "callback_id": "item_selection",
-                "title": {"type": "plain_text", "text": "Select Item"},
-                "blocks": blocks
+        # Warm the details of the likeliest picks while the user reads the list
+        get_prefetcher().prefetch(body["user"]["id"], [(item["id"], item_type) for item in results[:10]])
+        return {
+            "type": "modal",
+            "callback_id": "item_selection",
+            "title": {"type": "plain_text", "text": "Select Item"},
+            "blocks": blocks
+        }
+    
+    fill_modal(
+        client, "search_results", started_at, body["view"]["id"], None,
+        JOB_SEARCH,
+        lambda ninety: ninety.search_items(query, item_type, workspace_id),
+        build_results,
+        "Select Item", "Error searching items",
+        workspace_id=workspace_id,
+        coalesce_key=("search_items", query, item_type, workspace_id)
+    )
+
+def build_update_modal(item_type, item_id, item):
+    """Modal for editing an item, prefilled with its current details"""
+    modal = {
+        "type": "modal",
+        "callback_id": f"update_{item_type}_{item_id}",
+        "title": {"type": "plain_text", "text": f"Update {item_type.title()}"},
+        "submit": {"type": "plain_text", "text": "Update"},
+        "blocks": [
+            {
+                "type": "input",
+                "block_id": "title",
+                "label": {"type": "plain_text", "text": "Title"},
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "title_input",
+                    "initial_value": item["title"]
+                }
+            },
+            {
+                "type": "input",
+                "block_id": "description",
+                "label": {"type": "plain_text", "text": "Description"},
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "description_input",
+                    "multiline": True,
+                    "initial_value": item.get("description", "")
+                }
             }
-        )
-    except Exception as e:
-        client.chat_postMessage(
-            channel=body["user"]["id"],
-            text=f"❌ Error searching items: {str(e)}"
-        )
+        ]
+    }
+    
+    # Add status field for issues
+    if item_type == "issue":
+        options = [
+            {"text": {"type": "plain_text", "text": "Open"}, "value": "open"},
+            {"text": {"type": "plain_text", "text": "In Progress"}, "value": "in_progress"},
+            {"text": {"type": "plain_text", "text": "Resolved"}, "value": "resolved"}
+        ]
+        element = {
+            "type": "static_select",
+            "action_id": "status_select",
+            "options": options
+        }
+        # Preselect the current status only when the item has one Slack can match
+        status = (item.get("status") or "").strip().lower().replace(" ", "_")
+        for option in options:
+            if option["value"] == status:
+                element["initial_option"] = option
+        modal["blocks"].append({
+            "type": "input",
+            "block_id": "status",
+            "label": {"type": "plain_text", "text": "Status"},
+            "element": element
+        })
+    
+    # Add due date field for todos and issues
+    if item_type in ["todo", "issue"]:
+        modal["blocks"].append({
+            "type": "input",
+            "block_id": "due_date",
+            "optional": True,
+            "label": {"type": "plain_text", "text": "Due Date"},
+            "element": {
+                "type": "datepicker",
+                "action_id": "due_date_picker",
+                "initial_date": item.get("due_date", datetime.now().strftime("%Y-%m-%d"))
+            }
+        })
+    return modal
 
 @app.action(re.compile("select_item_.*"))
 def handle_item_selection(ack, body, client):
+    started_at = time.time()
     ack()
     # Extract item type and ID from action ID
     match = re.match(r"select_item_(\w+)_(\w+)", body["action_id"])
     if match:
         item_type, item_id = match.groups()
-        try:
-            ninety = get_ninety_instance()
-            item = ninety.get_item_details(item_id, item_type)
-            
-            # Create update modal
-            modal = {
-                "type": "modal",
-                "callback_id": f"update_{item_type}_{item_id}",
-                "title": {"type": "plain_text", "text": f"Update {item_type.title()}"},
-                "submit": {"type": "plain_text", "text": "Update"},
-                "blocks": [
-                    {
-                        "type": "input",
-                        "block_id": "title",
-                        "label": {"type": "plain_text", "text": "Title"},
-                        "element": {
-                            "type": "plain_text_input",
-                            "action_id": "title_input",
-                            "initial_value": item["title"]
-                        }
-                    },
-                    {
-                        "type": "input",
-                        "block_id": "description",
-                        "label": {"type": "plain_text", "text": "Description"},
-                        "element": {
-                            "type": "plain_text_input",
-                            "action_id": "description_input",
-                            "multiline": True,
-                            "initial_value": item.get("description", "")
-                        }
-                    }
-                ]
-            }
-            
-            # Add status field for issues
-            if item_type == "issue":
-                modal["blocks"].append({
-                    "type": "input",
-                    "block_id": "status",
-                    "label": {"type": "plain_text", "text": "Status"},
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "status_select",
-                        "initial_option": {"text": {"type": "plain_text", "text": item["status"]}, "value": item["status"].lower()},
-                        "options": [
-                            {"text": {"type": "plain_text", "text": "Open"}, "value": "open"},
-                            {"text": {"type": "plain_text", "text": "In Progress"}, "value": "in_progress"},
-                            {"text": {"type": "plain_text", "text": "Resolved"}, "value": "resolved"}
-                        ]
-                    }
-                })
-            
-            # Add due date field for todos and issues
-            if item_type in ["todo", "issue"]:
-                modal["blocks"].append({
-                    "type": "input",
-                    "block_id": "due_date",
-                    "optional": True,
-                    "label": {"type": "plain_text", "text": "Due Date"},
-                    "element": {
-                        "type": "datepicker",
-                        "action_id": "due_date_picker",
-                        "initial_date": item.get("due_date", datetime.now().strftime("%Y-%m-%d"))
-                    }
-                })
-            
-            client.views_update(
-                view_id=body["view"]["id"],
-                view=modal
-            )
-        except Exception as e:
-            client.chat_postMessage(
-                channel=body["user"]["id"],
-                text=f"❌ Error loading item details: {str(e)}"
-            )
+        get_prefetcher().record_use(body["user"]["id"], item_id, item_type)
+        
+        # Show the loading state first; its hash guards the update that follows
+        response = client.views_update(
+            view_id=body["view"]["id"],
+            hash=body["view"]["hash"],
+            view=message_view(f"Update {item_type.title()}", ":hourglass_flowing_sand: Loading item details...")
+        )
+        record_first_paint("update_item", started_at)
+        
+        fill_modal(
+            client, "update_item", started_at, response["view"]["id"], response["view"]["hash"],
+            JOB_SEARCH,
+            lambda ninety: ninety.get_item_details(item_id, item_type),
+            lambda item: build_update_modal(item_type, item_id, item),
+            f"Update {item_type.title()}", "Error loading item details",
+            coalesce_key=("get_item_details", item_id, item_type)
+        )
 
 @app.view(re.compile("update_.*"))
 def handle_item_update(ack, body, client):
@@ -1087,7 +1423,6 @@ def handle_item_update(ack, body, client):
         values = body["view"]["state"]["values"]
         
         try:
-            ninety = get_ninety_instance()
             updates = {
                 "title": values["title"]["title_input"]["value"],
                 "description": values["description"]["description_input"]["value"]
@@ -1099,11 +1434,17 @@ def handle_item_update(ack, body, client):
             if item_type in ["todo", "issue"]:
                 updates["due_date"] = values["due_date"]["due_date_picker"]["selected_date"]
             
-            result = ninety.update_item(item_id, item_type, updates)
-            
-            client.chat_postMessage(
-                channel=body["user"]["id"],
-                text=f"✅ {item_type.title()} updated successfully!"
+            enqueue_ninety_job(
+                JOB_UPDATE,
+                lambda ninety: ninety.update_item(item_id, item_type, updates),
+                on_success=lambda result: client.chat_postMessage(
+                    channel=body["user"]["id"],
+                    text=f"✅ {item_type.title()} updated successfully!"
+                ),
+                on_failure=lambda e: client.chat_postMessage(
+                    channel=body["user"]["id"],
+                    text=f"❌ Error updating {item_type}: {str(e)}"
+                )
             )
         except Exception as e:
             client.chat_postMessage(
@@ -1132,6 +1473,7 @@ def handle_create_issue_message(ack, shortcut, client):
 
 @app.shortcut("attach_to_item_message")
 def handle_attach_to_item_message(ack, shortcut, client):
+    started_at = time.time()
     ack()
     # Store message details in state for later use
     message_ts = shortcut["message"]["ts"]
@@ -1148,15 +1490,7 @@ def handle_attach_to_item_message(ack, shortcut, client):
                 "type": "input",
                 "block_id": "workspace",
                 "label": {"type": "plain_text", "text": "Workspace"},
-                "element": {
-                    "type": "static_select",
-                    "action_id": "workspace_select",
-                    "placeholder": {"type": "plain_text", "text": "Select workspace"},
-                    "options": [
-                        {"text": {"type": "plain_text", "text": workspace}, "value": workspace_id}
-                        for workspace_id, workspace in get_workspaces()
-                    ]
-                }
+                "element": workspace_select_element()
             },
             {
                 "type": "input",
@@ -1187,13 +1521,15 @@ def handle_attach_to_item_message(ack, shortcut, client):
         ]
     }
     client.views_open(trigger_id=shortcut["trigger_id"], view=modal)
+    record_first_paint("attach_form", started_at)
 
 @app.view(re.compile("attach_message_.*"))
 def handle_attach_message_search(ack, body, client):
-    ack()
+    started_at = time.time()
     # Extract channel_id and message_ts from callback_id
     match = re.match(r"attach_message_([^_]+)_(.+)", body["view"]["callback_id"])
     if not match:
+        ack()
         return
     
     channel_id, message_ts = match.groups()
@@ -1202,16 +1538,13 @@ def handle_attach_message_search(ack, body, client):
     item_type = values["item_type"]["type_select"]["selected_option"]["value"]
     query = values.get("search_query", {}).get("search_input", {}).get("value", "")
     
-    try:
-        ninety = get_ninety_instance()
-        results = ninety.search_items(query, item_type, workspace_id)
-        
+    # Swap the form for a loading view right away, then fill it from a job
+    ack(response_action="update", view=message_view("Select Item", ":hourglass_flowing_sand: Searching Ninety.io..."))
+    record_first_paint("attach_results", started_at)
+    
+    def build_results(results):
         if not results:
-            client.chat_postMessage(
-                channel=body["user"]["id"],
-                text="No items found matching your search."
-            )
-            return
+            return message_view("Select Item", "No items found matching your search.")
         
         # Create blocks for item selection
         blocks = [
@@ -1236,20 +1569,22 @@ def handle_attach_message_search(ack, body, client):
                 }
             })
         
-        client.views_update(
-            view_id=body["view"]["id"],
-            view={
-                "type": "modal",
-                "callback_id": "item_selection",
-                "title": {"type": "plain_text", "text": "Select Item"},
-                "blocks": blocks
-            }
-        )
-    except Exception as e:
-        client.chat_postMessage(
-            channel=body["user"]["id"],
-            text=f"❌ Error searching items: {str(e)}"
-        )
+        return {
+            "type": "modal",
+            "callback_id": "item_selection",
+            "title": {"type": "plain_text", "text": "Select Item"},
+            "blocks": blocks
+        }
+    
+    fill_modal(
+        client, "attach_results", started_at, body["view"]["id"], None,
+        JOB_SEARCH,
+        lambda ninety: ninety.search_items(query, item_type, workspace_id),
+        build_results,
+        "Select Item", "Error searching items",
+        workspace_id=workspace_id,
+        coalesce_key=("search_items", query, item_type, workspace_id)
+    )
 
 @app.action(re.compile("attach_to_.*"))
 def handle_attach_to_item(ack, body, client):
@@ -1261,38 +1596,34 @@ def handle_attach_to_item(ack, body, client):
         channel_id, message_ts = body["actions"][0]["value"].split("|")
         
         try:
-            # Get conversation history
-            result = client.conversations_history(
-                channel=channel_id,
-                latest=message_ts,
-                limit=1,
-                inclusive=True
-            )
-            
-            if not result["messages"]:
+            # The message, plus its replies when it starts a thread
+            parts = export_thread(client, channel_id, message_ts)
+            if not parts:
                 raise Exception("Message not found")
             
-            message = result["messages"][0]
-            user_info = client.users_info(user=message["user"])["user"]
-            
-            # Format the message
-            conversation_text = f"{user_info['real_name']}: {message['text']}"
+            def confirm(result):
+                # Send confirmation
+                client.chat_postMessage(
+                    channel=body["user"]["id"],
+                    text=f"✅ Message attached to {item_type} successfully!"
+                )
+                
+                # Add a reaction to the original message to indicate it was attached
+                client.reactions_add(
+                    channel=channel_id,
+                    timestamp=message_ts,
+                    name="link"
+                )
             
             # Attach to item
-            ninety = get_ninety_instance()
-            ninety.attach_conversation(item_id, item_type, conversation_text)
-            
-            # Send confirmation
-            client.chat_postMessage(
-                channel=body["user"]["id"],
-                text=f"✅ Message attached to {item_type} successfully!"
-            )
-            
-            # Add a reaction to the original message to indicate it was attached
-            client.reactions_add(
-                channel=channel_id,
-                timestamp=message_ts,
-                name="link"
+            enqueue_ninety_job(
+                JOB_ATTACH,
+                lambda ninety: ninety.attach_conversation_parts(item_id, item_type, parts),
+                on_success=confirm,
+                on_failure=lambda e: client.chat_postMessage(
+                    channel=body["user"]["id"],
+                    text=f"❌ Error attaching message: {str(e)}"
+                )
             )
         except Exception as e:
             client.chat_postMessage(
@@ -1305,63 +1636,88 @@ def handle_create_from_message(ack, shortcut, client):
     """Handle creating new items from messages"""
     ack()
     
-    message_text = shortcut["message"]["text"]
-    message_link = shortcut["message"]["permalink"]
+    message = shortcut["message"]
+    message_text = message["text"]
+    message_link = message["permalink"]
+    line_titles = parse_bulk_titles(message_text)
+    
+    # Bulk modes are offered only when the message has several lines or a thread
+    mode_options = [{"text": {"type": "plain_text", "text": "One item from this message"}, "value": "single"}]
+    if len(line_titles) > 1:
+        mode_options.append({"text": {"type": "plain_text", "text": "One item per line"}, "value": "lines"})
+    if message.get("reply_count"):
+        mode_options.append({"text": {"type": "plain_text", "text": "One item per message in the thread"}, "value": "thread"})
     
     # Show item creation modal
-    client.views_open(
-        trigger_id=shortcut["trigger_id"],
-        view={
-            "type": "modal",
-            "title": {"type": "plain_text", "text": "Create in Ninety.io"},
-            "submit": {"type": "plain_text", "text": "Create"},
-            "blocks": [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"Create an item from:\n>{message_text}"
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "item_type",
-                    "label": {"type": "plain_text", "text": "Item Type"},
-                    "element": {
-                        "type": "static_select",
-                        "options": [
-                            {"text": {"type": "plain_text", "text": "Rock"}, "value": "rock"},
-                            {"text": {"type": "plain_text", "text": "To-do"}, "value": "todo"},
-                            {"text": {"type": "plain_text", "text": "Issue"}, "value": "issue"},
-                            {"text": {"type": "plain_text", "text": "Headline"}, "value": "headline"}
-                        ]
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "title",
-                    "label": {"type": "plain_text", "text": "Title"},
-                    "element": {
-                        "type": "plain_text_input",
-                        "initial_value": message_text[:100]
-                    }
-                },
-                {
-                    "type": "input",
-                    "block_id": "team",
-                    "label": {"type": "plain_text", "text": "Team"},
-                    "element": {
-                        "type": "static_select",
-                        "options": [
-                            {"text": {"type": "plain_text", "text": "Leadership Team"}, "value": "leadership"},
-                            {"text": {"type": "plain_text", "text": "Development"}, "value": "development"},
-                            # Add other teams as needed
-                        ]
-                    }
+    view = {
+        "type": "modal",
+        "callback_id": "create_from_message",
+        "title": {"type": "plain_text", "text": "Create in Ninety.io"},
+        "submit": {"type": "plain_text", "text": "Create"},
+        "private_metadata": bulk_metadata(
+            {"channel": shortcut["channel"]["id"], "thread_ts": message.get("thread_ts", message["ts"])},
+            line_titles[:NINETY_BULK_CREATE_MAX_ITEMS + 1] if len(line_titles) > 1 else []
+        ),
+        "blocks": [
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"Create an item from:\n>{message_text}"
                 }
-            ]
-        }
-    )
+            },
+            {
+                "type": "input",
+                "block_id": "item_type",
+                "label": {"type": "plain_text", "text": "Item Type"},
+                "element": {
+                    "type": "static_select",
+                    "action_id": "static_select",
+                    "options": [
+                        {"text": {"type": "plain_text", "text": "Rock"}, "value": "rock"},
+                        {"text": {"type": "plain_text", "text": "To-do"}, "value": "todo"},
+                        {"text": {"type": "plain_text", "text": "Issue"}, "value": "issue"},
+                        {"text": {"type": "plain_text", "text": "Headline"}, "value": "headline"}
+                    ]
+                }
+            },
+            {
+                "type": "input",
+                "block_id": "title",
+                "optional": True,
+                "label": {"type": "plain_text", "text": "Title"},
+                "hint": {"type": "plain_text", "text": "Used when creating one item from this message"},
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "plain_text_input",
+                    "initial_value": message_text[:100]
+                }
+            }
+        ]
+    }
+    if len(mode_options) > 1:
+        view["blocks"].insert(2, {
+            "type": "input",
+            "block_id": "mode",
+            "label": {"type": "plain_text", "text": "Create"},
+            "element": {
+                "type": "radio_buttons",
+                "action_id": "mode_select",
+                "initial_option": mode_options[0],
+                "options": mode_options
+            }
+        })
+    client.views_open(trigger_id=shortcut["trigger_id"], view=view)
+
+def thread_titles(client, channel, thread_ts):
+    """One title per message of a thread, from the first line of each, capped one past the bulk limit"""
+    response = client.conversations_replies(channel=channel, ts=thread_ts, limit=NINETY_BULK_CREATE_MAX_ITEMS + 1)
+    titles = []
+    for message in response["messages"]:
+        lines = parse_bulk_titles(message.get("text", ""))
+        if lines:
+            titles.append(lines[0])
+    return titles[:NINETY_BULK_CREATE_MAX_ITEMS + 1]
 
 @app.shortcut("link_to_item")
 def handle_link_to_item(ack, shortcut, client):
@@ -1525,36 +1881,56 @@ def handle_update_definition_of_done(ack, shortcut, client):
 @app.view("create_from_message")
 def handle_create_submission(ack, body, client):
     """Handle submission of create item modal"""
-    ack()
-    
     values = body["view"]["state"]["values"]
     item_type = values["item_type"]["static_select"]["selected_option"]["value"]
-    title = values["title"]["plain_text_input"]["value"]
-    team = values["team"]["static_select"]["selected_option"]["value"]
+    title = values["title"]["plain_text_input"].get("value")
+    mode = values.get("mode", {}).get("mode_select", {}).get("selected_option", {}).get("value", "single")
     
-    try:
-        ninety = get_ninety_instance()
+    # The title is optional in the modal because bulk modes ignore it
+    if mode == "single" and not (title or "").strip():
+        ack(response_action="errors", errors={"title": "Enter a title to create one item"})
+        return
+    ack()
+    
+    def notify(text):
+        client.chat_postEphemeral(channel=body["user"]["id"], user=body["user"]["id"], text=text)
+    
+    if mode != "single":
+        source = json.loads(body["view"]["private_metadata"])
+        shortened = ()
+        if mode == "lines":
+            titles = source["lines"]
+            shortened = source.get("shortened", ())
+        else:
+            try:
+                titles = thread_titles(client, source["channel"], source["thread_ts"])
+            except SlackApiError as e:
+                log_error(e, {"action": "create_from_thread", "channel": source["channel"]})
+                notify(f"❌ Error reading the thread: {str(e)}")
+                return
+        enqueue_bulk_create(item_type, titles, notify=notify, notify_error=notify, shortened=shortened)
+        return
+    
+    def create(ninety):
         if item_type == "rock":
-            result = ninety.create_rock(title, team=team)
-        elif item_type == "todo":
-            result = ninety.create_todo(title, team=team)
-        elif item_type == "issue":
-            result = ninety.create_issue(title, team=team)
-        else:  # headline
-            result = ninety.create_headline(title, team=team)
-        
+            return ninety.create_rock(title)
+        return create_item_by_type(ninety, item_type, title)
+    
+    enqueue_ninety_job(
+        JOB_CREATE,
+        create,
         # Notify user of success
-        client.chat_postEphemeral(
+        on_success=lambda result: client.chat_postEphemeral(
             channel=body["user"]["id"],
             user=body["user"]["id"],
             text=f"✅ Created {item_type}: {result['title']}\n{result.get('url', '')}"
-        )
-    except Exception as e:
-        client.chat_postEphemeral(
+        ),
+        on_failure=lambda e: client.chat_postEphemeral(
             channel=body["user"]["id"],
             user=body["user"]["id"],
             text=f"❌ Error creating {item_type}: {str(e)}"
         )
+    )
 
 # Add other view submission handlers similarly
 # ... existing code ... 
\ No newline at end of file
@@ -0,0 +1,69 @@
+from typing import Dict, Iterable, Optional
+from cache import TTLCache
+from config import SLACK_USER_CACHE_SIZE, SLACK_USER_CACHE_TTL
+from monitoring import SLACK_USER_LOOKUPS, log_error, logger
+
+class SlackUserCache:
+    """Process-wide cache of Slack user profiles.
+
+    Lookups are deduplicated per batch and served from the cache where
+    possible, so formatting a long thread costs one users.info call per
+    distinct uncached author instead of one per message.
+    """
+
+    def __init__(self, maxsize: int = SLACK_USER_CACHE_SIZE, ttl: float = SLACK_USER_CACHE_TTL):
+        self._cache = TTLCache("slack_users", maxsize=maxsize, ttl=ttl)
+
+    def get_users(self, client, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Return profiles for user_ids keyed by ID, calling users.info only for cache misses.
+
+        Users whose lookup fails are logged and left out, so callers fall
+        back to whatever name the message itself carries.
+        """
+        user_ids = [user_id for user_id in user_ids if user_id]
+        unique_ids = set(user_ids)
+        SLACK_USER_LOOKUPS.labels(source="dedup").inc(len(user_ids) - len(unique_ids))
+
+        users = {}
+        for user_id in unique_ids:
+            user = self._cache.get(user_id)
+            if user is not None:
+                SLACK_USER_LOOKUPS.labels(source="cache").inc()
+            else:
+                SLACK_USER_LOOKUPS.labels(source="api").inc()
+                try:
+                    user = client.users_info(user=user_id)["user"]
+                except Exception as e:
+                    log_error(e, {"action": "lookup_slack_user", "user_id": user_id})
+                    continue
+                self._cache.set(user_id, user)
+            users[user_id] = user
+        return users
+
+    def get_user(self, client, user_id: str) -> Optional[Dict]:
+        """Return a single user profile, or None if it could not be looked up"""
+        return self.get_users(client, [user_id]).get(user_id)
+
+    def warm(self, client, page_size: int = 200) -> int:
+        """Fill the cache from users.list, returning the number of profiles loaded"""
+        loaded = 0
+        cursor = None
+        try:
+            while True:
+                response = client.users_list(limit=page_size, cursor=cursor)
+                for user in response["members"]:
+                    self._cache.set(user["id"], user)
+                    loaded += 1
+                cursor = response.get("response_metadata", {}).get("next_cursor")
+                if not cursor:
+                    break
+        except Exception as e:
+            log_error(e, {"action": "warm_user_cache"})
+        logger.info("user_cache_warmed", users=loaded)
+        return loaded
+
+def display_name(user: Dict) -> str:
+    """Best human-readable name for a Slack user profile"""
+    return user.get("real_name") or user.get("name") or user.get("id", "Unknown")
+
+user_cache = SlackUserCache()
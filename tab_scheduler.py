@@ -0,0 +1,158 @@
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Generator, Hashable, List, Optional
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from monitoring import TAB_OPERATIONS, REQUEST_LATENCY, logger
+
+# A tab operation is a generator that drives the browser in its own tab. It
+# starts work without blocking (e.g. NinetyAutomation._start_load) and yields a
+# readiness check taking the driver; it is resumed in the same tab once that
+# check returns truthy, and its return value is the operation's result.
+TabOperation = Generator[Callable[[Any], Any], None, Any]
+
+class _Slot:
+    """One browser tab and the operation currently assigned to it"""
+
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.key: Optional[Hashable] = None
+        self.operation: Optional[TabOperation] = None
+        self.ready: Optional[Callable[[Any], Any]] = None
+        self.deadline = 0.0
+
+class TabScheduler:
+    """Multiplexes independent operations across tabs of one logged-in browser.
+
+    WebDriver runs one command at a time per session, so tabs do not execute
+    in parallel; what overlaps is the waiting. Each operation starts a page
+    load in a free tab and yields, the scheduler moves on to start or poll
+    the others, and resumes an operation only once its tab is ready. Tabs
+    share the browser's cookies, so no extra login or Chrome process is
+    needed.
+    """
+
+    def __init__(self, driver, max_tabs: int, step_timeout: float = 10, poll_interval: float = 0.05):
+        if max_tabs < 1:
+            raise ValueError(f"Invalid tab count: {max_tabs}")
+        self.driver = driver
+        self.max_tabs = max_tabs
+        self.step_timeout = step_timeout
+        self.poll_interval = poll_interval
+        self._handles: List[str] = []
+
+    def run(self, operations: Dict[Hashable, Callable[[], TabOperation]],
+            deadline: Optional[float] = None) -> Dict[Hashable, Future]:
+        """Run every operation to completion, returning a finished Future per key"""
+        futures = {key: Future() for key in operations}
+        self.run_into(operations, futures, deadline)
+        return futures
+
+    def run_into(self, operations: Dict[Hashable, Callable[[], TabOperation]],
+                 futures: Dict[Hashable, Future], deadline: Optional[float] = None) -> None:
+        """Run operations, resolving the caller's futures as each one finishes.
+
+        ``deadline`` is an absolute time.time() by which the whole run must
+        finish; operations still running or not yet started then fail with
+        TimeoutException.
+        """
+        pending: Deque[Hashable] = deque(operations)
+        start_time = time.time()
+        home = self.driver.current_window_handle
+        slots = [_Slot(handle) for handle in self._open_tabs(home, min(self.max_tabs, len(pending)))]
+        try:
+            while pending or any(slot.operation for slot in slots):
+                progressed = False
+                for slot in slots:
+                    if slot.operation is None:
+                        if not pending:
+                            continue
+                        key = pending.popleft()
+                        if deadline is not None and time.time() > deadline:
+                            TAB_OPERATIONS.labels(status="failure").inc()
+                            futures[key].set_exception(TimeoutException(f"Tab operation {key!r} not started by the deadline"))
+                            progressed = True
+                            continue
+                        slot.key = key
+                        slot.operation = operations[key]()
+                        self.driver.switch_to.window(slot.handle)
+                        self._advance(slot, futures, None, deadline)
+                        progressed = True
+                        continue
+
+                    self.driver.switch_to.window(slot.handle)
+                    try:
+                        ready = slot.ready(self.driver)
+                    except WebDriverException:
+                        ready = False
+                    if ready:
+                        self._advance(slot, futures, ready, deadline)
+                        progressed = True
+                    elif time.time() > slot.deadline:
+                        self._fail(slot, futures, TimeoutException(f"Tab operation {slot.key!r} timed out"))
+                        progressed = True
+                if not progressed:
+                    time.sleep(self.poll_interval)
+        except Exception as e:
+            # The browser itself failed; nothing left in flight can finish
+            for slot in slots:
+                if slot.operation is not None:
+                    self._fail(slot, futures, e)
+            for key in pending:
+                futures[key].set_exception(e)
+            raise
+        finally:
+            try:
+                self.driver.switch_to.window(home)
+            except WebDriverException:
+                pass
+        REQUEST_LATENCY.labels(type="tab_batch").observe(time.time() - start_time)
+        logger.info("tab_batch_completed", operations=len(operations), tabs=len(slots))
+
+    def close(self) -> None:
+        """Close the extra tabs, leaving the original window open"""
+        for handle in self._handles:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except WebDriverException:
+                pass
+        self._handles = []
+
+    def _open_tabs(self, home: str, count: int) -> List[str]:
+        """The original window plus enough extra tabs, reused across runs"""
+        open_handles = set(self.driver.window_handles)
+        self._handles = [handle for handle in self._handles if handle in open_handles]
+        while len(self._handles) + 1 < count:
+            self.driver.switch_to.new_window("tab")
+            self._handles.append(self.driver.current_window_handle)
+        self.driver.switch_to.window(home)
+        return [home] + self._handles[:count - 1]
+
+    def _advance(self, slot: _Slot, futures: Dict[Hashable, Future], value: Any,
+                 deadline: Optional[float]) -> None:
+        """Resume the operation in its tab until it yields its next readiness check or finishes"""
+        try:
+            slot.ready = slot.operation.send(value) if value is not None else next(slot.operation)
+            slot.deadline = time.time() + self.step_timeout
+            if deadline is not None:
+                slot.deadline = min(slot.deadline, deadline)
+        except StopIteration as done:
+            TAB_OPERATIONS.labels(status="success").inc()
+            futures[slot.key].set_result(done.value)
+            self._release(slot)
+        except Exception as e:
+            TAB_OPERATIONS.labels(status="failure").inc()
+            futures[slot.key].set_exception(e)
+            self._release(slot)
+
+    def _fail(self, slot: _Slot, futures: Dict[Hashable, Future], error: Exception) -> None:
+        TAB_OPERATIONS.labels(status="failure").inc()
+        slot.operation.close()
+        futures[slot.key].set_exception(error)
+        self._release(slot)
+
+    def _release(self, slot: _Slot) -> None:
+        slot.key = None
+        slot.operation = None
+        slot.ready = None
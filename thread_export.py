@@ -0,0 +1,87 @@
+from typing import Dict, Iterable, Iterator, List
+from config import SLACK_THREAD_PAGE_SIZE, NINETY_COMMENT_MAX_CHARS
+from monitoring import THREAD_EXPORT_MESSAGES, THREAD_EXPORT_CHUNKS, logger
+from slack_users import user_cache, display_name
+
+def conversation_header(attached_at: str, index: int, total: int) -> str:
+    """Heading posted above each part of an attached conversation"""
+    header = f"Slack Conversation (attached {attached_at})"
+    if total > 1:
+        header += f", part {index} of {total}"
+    return f"{header}:\n\n"
+
+# Room left in every comment for its header, sized for up to 9999 parts
+COMMENT_HEADER_RESERVE = len(conversation_header("0000-00-00 00:00:00", 9999, 9999))
+COMMENT_BODY_MAX_CHARS = NINETY_COMMENT_MAX_CHARS - COMMENT_HEADER_RESERVE
+
+def iter_thread_messages(client, channel: str, thread_ts: str,
+                         page_size: int = SLACK_THREAD_PAGE_SIZE) -> Iterator[Dict]:
+    """Every message of a thread, oldest first, following conversations.replies cursors.
+
+    A ts that is not a thread parent yields just that message.
+    """
+    cursor = None
+    while True:
+        response = client.conversations_replies(channel=channel, ts=thread_ts, limit=page_size, cursor=cursor)
+        yield from response["messages"]
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            return
+
+def format_messages(client, messages: Iterable[Dict]) -> List[str]:
+    """One "Name: text" entry per Slack message, resolving all authors in one cached batch"""
+    messages = list(messages)
+    users = user_cache.get_users(client, [msg.get("user") for msg in messages])
+    entries = []
+    for msg in messages:
+        user = users.get(msg.get("user"))
+        name = display_name(user) if user else msg.get("username", "Unknown")
+        # File shares and other subtype messages may carry no text
+        entries.append(f"{name}: {msg.get('text', '')}")
+    return entries
+
+def format_conversation(client, messages: Iterable[Dict]) -> str:
+    """Format Slack messages as "Name: text" lines"""
+    return "\n".join(format_messages(client, messages))
+
+def _split_entry(entry: str, max_chars: int) -> List[str]:
+    """Cut one over-long message at whitespace where possible"""
+    pieces = []
+    while len(entry) > max_chars:
+        cut = entry.rfind(" ", 0, max_chars)
+        cut = cut if cut > 0 else max_chars
+        pieces.append(entry[:cut])
+        entry = entry[cut:].lstrip()
+    pieces.append(entry)
+    return pieces
+
+def chunk_messages(entries: Iterable[str], max_chars: int = COMMENT_BODY_MAX_CHARS) -> List[str]:
+    """Pack formatted messages into comment-sized chunks of at most max_chars.
+
+    The default leaves room for the header of each comment. Messages are kept whole and in order; only a message longer than a
+    chunk on its own is split.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for entry in entries:
+        for piece in _split_entry(entry, max_chars):
+            # +1 for the newline joining it to the previous message
+            if current and size + 1 + len(piece) > max_chars:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            size += len(piece) + (1 if current else 0)
+            current.append(piece)
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+def export_thread(client, channel: str, thread_ts: str,
+                  max_chars: int = COMMENT_BODY_MAX_CHARS) -> List[str]:
+    """A whole thread as Ninety.io comment texts, split into chunks of at most max_chars"""
+    messages = list(iter_thread_messages(client, channel, thread_ts))
+    chunks = chunk_messages(format_messages(client, messages), max_chars)
+    THREAD_EXPORT_MESSAGES.observe(len(messages))
+    THREAD_EXPORT_CHUNKS.observe(len(chunks))
+    logger.info("thread_exported", channel=channel, messages=len(messages), chunks=len(chunks))
+    return chunks
@@ -0,0 +1,68 @@
+import threading
+import time
+from typing import Callable, ContextManager, List, Tuple
+from monitoring import REQUEST_LATENCY, log_error, logger
+
+DEFAULT_WORKSPACES = [("default", "Default Workspace")]
+
+# Slack shows at most 100 options in an external_select
+MAX_OPTIONS = 100
+
+class WorkspaceDirectory:
+    """Process-wide list of Ninety.io workspaces for the workspace pickers.
+
+    Served from memory so options-load requests answer within Slack's
+    deadline; a background thread re-lists the workspaces every
+    ``refresh_interval`` seconds. Until the first listing succeeds the
+    default workspace is offered.
+    """
+
+    def __init__(self, session_factory: Callable[[], ContextManager], refresh_interval: float):
+        self._session_factory = session_factory
+        self.refresh_interval = refresh_interval
+        self._workspaces: List[Tuple[str, str]] = list(DEFAULT_WORKSPACES)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ninety-workspaces", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def list(self) -> List[Tuple[str, str]]:
+        """Known (workspace_id, name) pairs"""
+        return list(self._workspaces)
+
+    def search(self, query: str = "") -> List[Tuple[str, str]]:
+        """Workspaces whose name contains query, case-insensitively"""
+        query = (query or "").strip().lower()
+        matches = [(workspace_id, name) for workspace_id, name in self._workspaces if query in name.lower()]
+        return matches[:MAX_OPTIONS]
+
+    def refresh(self) -> None:
+        """Re-list the workspaces from Ninety.io, keeping the previous list on failure"""
+        start_time = time.time()
+        try:
+            with self._session_factory() as ninety:
+                workspaces = ninety.get_workspaces()
+        except Exception as e:
+            log_error(e, {"action": "refresh_workspaces"})
+            return
+        finally:
+            REQUEST_LATENCY.labels(type="workspace_refresh").observe(time.time() - start_time)
+        # Scraped rows may lack fields: skip rows without an id and show the id for unnamed ones
+        listed = [
+            (w["id"], (w.get("name") or "").strip() or w["id"])
+            for w in workspaces or [] if w.get("id")
+        ]
+        if len(listed) < len(workspaces or []):
+            logger.info("workspaces_skipped", skipped=len(workspaces) - len(listed))
+        if listed:
+            self._workspaces = listed
+        logger.info("workspaces_refreshed", workspaces=len(self._workspaces))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)